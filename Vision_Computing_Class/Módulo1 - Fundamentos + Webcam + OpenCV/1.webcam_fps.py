@@ -1,39 +1,64 @@
+import argparse
+
 import cv2
-import time
 
-# Iniciar webcam
-cap = cv2.VideoCapture(0)  # 0 = cámara principal
+from capture import FrameGrabber
+from instrumentation import Instrumentation, draw_overlay
+from sources import open_source
+
+parser = argparse.ArgumentParser(description="Webcam con contador de FPS")
+parser.add_argument("--source", default="0",  # 0 = cámara principal
+                    help="Fuente de video: índice de cámara, archivo, carpeta de imágenes o synthetic:WxH@fps")
+parser.add_argument("--stats", action="store_true",
+                    help="Mostrar también los percentiles de tiempo de cada etapa y los frames descartados")
+args = parser.parse_args()
+
+# Iniciar webcam (o la fuente indicada)
+cap = open_source(args.source)
 
 # Validar si abrió
 if not cap.isOpened():
     print("No se pudo abrir la webcam :(")
     exit()
 
-# Variables para calcular FPS
-prev_time = 0
+# Tiempos por etapa y FPS sobre una ventana de frames (no un solo intervalo)
+stats = Instrumentation()
+
+# Leer la cámara en un hilo propio
+grabber = FrameGrabber(cap, stats=stats)
+if not grabber.start():
+    print("No se pudo leer un frame")
+    cap.release()
+    exit()
+
+last_sequence = 0
 
 while True:
-    ret, frame = cap.read()
-    if not ret:
+    # Esperar el siguiente frame de la cámara
+    frame, sequence, timestamp = grabber.wait_latest(last_sequence, timeout=1.0)
+    if sequence == last_sequence:
         print("No se pudo leer un frame")
         break
+    last_sequence = sequence
 
-    # Calcular FPS
-    current_time = time.time()
-    fps = 1 / (current_time - prev_time) if prev_time != 0 else 0
-    prev_time = current_time
+    stats.tick()
 
-    # Mostrar FPS en pantalla
-    cv2.putText(frame, f"FPS: {fps:.2f}", (10, 30),
+    # Mostrar FPS en pantalla (promedio de los últimos frames)
+    cv2.putText(frame, f"FPS: {stats.fps():.2f}", (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    if args.stats:
+        draw_overlay(frame, stats.overlay_lines()[1:] + [f"descartados: {grabber.dropped_frames}"],
+                     origin=(10, 60))
 
-    # Mostrar frame
-    cv2.imshow("Webcam", frame)
+    # Mostrar frame; waitKey es el que dibuja la ventana
+    with stats.stage("paint"):
+        cv2.imshow("Webcam", frame)
+        key = cv2.waitKey(1)
 
     # Salir con 'q'
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if key & 0xFF == ord('q'):
         break
 
 # Liberar recursos
-cap.release()
+grabber.stop()
 cv2.destroyAllWindows()
@@ -0,0 +1,821 @@
+"""Aplicación de tiempo real compartida por los scripts de bordes y de filtros.
+
+RealtimeApp arma la interfaz a partir de un grafo de filtros (graph.py):
+los modos, los controles y el proceso de cada frame salen del grafo, así
+que 2.edge_detection_realtime.py y 3.filters_realtime.py solo eligen el
+grafo y el título de la ventana. main arma las opciones de línea de
+comandos, comunes a ambos.
+"""
+import argparse
+import os
+import threading
+import time
+
+import tkinter as tk
+from tkinter import ttk
+
+from buffers import BufferPool
+from capture import FrameGrabber
+from compare import ComparisonGrid
+from display import DisplaySink, prepare_display
+from framestore import FrameStoreWriter
+from freeze import FrozenFrame
+from governor import ResolutionGovernor
+from graph import load_graph
+from instrumentation import Instrumentation, draw_overlay
+from memo import FrameMemo
+from metrics import MetricsExporter
+from multicam import MultiSource
+from params import ParamStore
+from process_pipeline import ProcessPipeline
+from recording import POLICIES, VIDEO_EXTENSIONS, Recorder
+from sources import open_source
+from tiling import TiledExecutor
+from tracing import FpsDropTrigger, SamplingProfiler, TraceRecorder
+from widgets import build_mode_buttons, build_param_frames, create_param_vars
+from workers import BACKENDS, ProcessingPool
+
+class RealtimeApp:
+    """Video en tiempo real con los modos y parámetros de un grafo de filtros"""
+    def __init__(self, root, graph, title, *, source_uri="0", target_fps=0, workers=0, backend="thread", depth=0,
+                 processes=False, tiles=0, memo=False,
+                 overlay=False, metrics_port=0, metrics_jsonl=None, metrics_interval=10.0,
+                 trace=False, trace_fps=0.0, trace_dir=".", trace_sample_ms=0,
+                 record=False, record_dir=".", record_format=".mp4", record_fps=0.0, record_options=None,
+                 dump_frames=None, sources=None, compare=False, compare_full=False):
+        self.root = root
+        # Tiempos por etapa, contadores y FPS (ver instrumentation.py); overlay los dibuja sobre el video
+        self.stats = Instrumentation()
+        self.overlay = overlay
+        # Trazado por frame (ver tracing.py): las etapas de stats y del grafo van al anillo
+        self.tracer = TraceRecorder()
+        self.stats.tracer = self.tracer
+        self.trace_dir = trace_dir
+        self.trace_trigger = FpsDropTrigger(self.stats, trace_fps) if trace_fps > 0 else None
+        self.profiler = None
+        if trace_sample_ms > 0:
+            self.profiler = SamplingProfiler(self.tracer, threading.get_ident(), trace_sample_ms / 1000)
+        self.last_update_end = None
+        # Grafo de filtros que define los modos y sus parámetros
+        self.graph = graph
+        self.graph.tracer = self.tracer
+        self.title = title
+        self.root.title(title)
+        
+        self.pipeline = None
+        self.multi = None
+        self.workers_requested = workers > 0
+        if processes:
+            # Captura y filtros en procesos propios; los frames pasan por memoria compartida
+            self.pipeline = ProcessPipeline(source_uri, self.graph)
+            if not self.pipeline.start():
+                print("No se pudo abrir la fuente de video")
+                self.root.destroy()
+                return
+            self.camera_width = self.pipeline.width
+            self.camera_height = self.pipeline.height
+        elif sources:
+            # Varias fuentes, cada una con su hilo de captura, mostradas en mosaico
+            self.multi = MultiSource(sources, stats=self.stats)
+            if not self.multi.start():
+                self.root.destroy()
+                return
+            self.camera_width = self.multi.width
+            self.camera_height = self.multi.height
+        else:
+            # Inicializar la fuente de video (webcam, archivo, carpeta o sintética)
+            self.cap = open_source(source_uri)
+            if not self.cap.isOpened():
+                print("No se pudo abrir la fuente de video")
+                self.root.destroy()
+                return
+            
+            # Leer la cámara en un hilo propio para no bloquear la interfaz
+            # Opcionalmente, guardar cada frame capturado crudo para repetirlo después (framestore.py)
+            dump = FrameStoreWriter(dump_frames, self.cap.fps) if dump_frames else None
+            self.grabber = FrameGrabber(self.cap, stats=self.stats, dump=dump)
+            if not self.grabber.start():
+                print("No se pudo leer de la fuente de video")
+                self.cap.release()
+                self.root.destroy()
+                return
+            
+            # Obtener dimensiones de la cámara
+            self.camera_width = self.cap.width
+            self.camera_height = self.cap.height
+        self.last_sequence = 0
+        
+        # Variables de estado
+        self.mode = self.graph.default_mode
+        self.is_running = False
+        self.display_width = self.camera_width
+        self.display_height = self.camera_height
+        
+        # Buffers reutilizados entre frames para no reservar memoria en cada uno
+        self.pool = BufferPool()
+        
+        # Una variable de Tk por cada parámetro del grafo
+        self.param_vars = create_param_vars(self.graph)
+        # Snapshot inmutable que leen update_frame y process_frame (sin tocar Tk)
+        self.params = ParamStore(self.graph.defaults())
+        
+        # Crear interfaz
+        self.create_ui()
+        
+        # Ajustar tamaño de ventana después de crear la UI
+        self.adjust_window_size()
+        
+        # Modo adaptativo: procesar a menor resolución para alcanzar target_fps.
+        # Nunca se procesa por encima del tamaño con que se muestra el video.
+        self.governor = None
+        if target_fps > 0:
+            max_scale = min(1.0, self.display_width / self.camera_width)
+            if self.multi is not None:
+                # El detalle que entra en una celda del mosaico
+                max_scale *= self.multi.max_scale
+            self.governor = ResolutionGovernor(target_fps, min_scale=min(0.25, max_scale),
+                                               max_scale=max_scale)
+        
+        # Procesamiento opcional en varios hilos o procesos
+        self.workers = None
+        if workers > 0:
+            self.workers = ProcessingPool(self.graph, workers, backend, depth)
+        self.resize_time = 0.0
+        
+        # Procesar cada frame por franjas en paralelo (menor latencia en frames grandes)
+        self.tiler = TiledExecutor(self.graph, tiles) if tiles > 1 else None
+        
+        # Reutilizar el último resultado si llega un frame repetido con los mismos parámetros
+        self.memo = FrameMemo() if memo else None
+        self.memo_sequence = None  # Frame enviado a los workers cuyo resultado espera el caché
+        
+        # Modo congelado: frame fijo que se recalcula al mover los controles
+        self.frozen = None
+        self.render_pending = False
+        
+        # Vista de comparación: todos los modos del grafo en una grilla (ver compare.py)
+        self.comparison = ComparisonGrid(self.graph, downscale=not compare_full)
+        self.comparing = False
+        if compare:
+            self.toggle_compare()
+        
+        # Exportación opcional de métricas: Prometheus por HTTP y/o registros JSONL periódicos
+        self.metrics = None
+        self.gauges = {}  # Valores instantáneos tomados por refresh_gauges
+        if metrics_port or metrics_jsonl:
+            self.metrics = MetricsExporter(self.stats, self.metric_gauges, self.get_params)
+            if metrics_port:
+                self.metrics.serve(metrics_port)
+            if metrics_jsonl:
+                self.metrics.record_to(metrics_jsonl, metrics_interval)
+        
+        if trace:
+            self.toggle_trace()
+        
+        # Grabación opcional del video procesado (ver recording.py)
+        self.recorder = None
+        self.record_dir = record_dir
+        self.record_format = record_format
+        source_fps = self.cap.fps if self.pipeline is None and self.multi is None else 30.0
+        self.record_fps = record_fps or target_fps or source_fps
+        self.record_options = record_options or {}
+        if record:
+            self.toggle_recording()
+        
+        # Iniciar captura de video
+        self.is_running = True
+        if self.metrics is not None:
+            # El pool y los demás objetos solo se leen desde este hilo (ver refresh_gauges)
+            self.refresh_gauges()
+        self.update_frame()
+        
+    def create_ui(self):
+        # Frame principal con scroll
+        self.canvas = tk.Canvas(self.root)
+        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
+        self.scrollable_frame = ttk.Frame(self.canvas)
+        
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+        
+        self.canvas_window = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        
+        self.canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Ajustar ancho del canvas cuando cambie el tamaño del frame
+        def configure_canvas_width(event):
+            canvas_width = event.width
+            self.canvas.itemconfig(self.canvas_window, width=canvas_width)
+        self.canvas.bind('<Configure>', configure_canvas_width)
+        
+        # Configurar scroll con mouse wheel
+        def _on_mousewheel(event):
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # Frame principal dentro del scrollable
+        main_frame = ttk.Frame(self.scrollable_frame, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Configurar grid
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        
+        # Frame para el video
+        video_frame = ttk.Frame(main_frame)
+        video_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
+        main_frame.rowconfigure(0, weight=0)  # No expandir, tamaño fijo
+        
+        # Label para mostrar el video
+        self.video_label = ttk.Label(video_frame, background="black")
+        self.video_label.pack()
+        self.display_sink = DisplaySink(self.video_label, self.stats)
+        
+        # Frame para controles
+        self.controls_frame = ttk.LabelFrame(main_frame, text="Controles", padding="10")
+        self.controls_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
+        controls_frame = self.controls_frame
+        
+        # Botones de modo
+        mode_frame = ttk.LabelFrame(controls_frame, text="Modos de Visualización", padding="5")
+        mode_frame.pack(fill=tk.X, pady=5)
+        
+        # Frame para botones de modo con información
+        mode_buttons_frame = ttk.Frame(mode_frame)
+        mode_buttons_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        build_mode_buttons(mode_buttons_frame, self.graph, self.set_mode)
+        
+        # Frame para descripción del modo actual (donde estaban los títulos de parámetros)
+        self.mode_description_frame = ttk.Frame(controls_frame)
+        self.mode_description_frame.pack(fill=tk.X, pady=5)
+        self.mode_description_label = ttk.Label(self.mode_description_frame, 
+                                                text="", 
+                                                foreground="gray",
+                                                wraplength=600,
+                                                justify=tk.LEFT)
+        self.mode_description_label.pack(anchor=tk.W, padx=5)
+        
+        # Un frame de parámetros por grupo; solo se muestran los que usa el modo actual
+        self.param_frames = build_param_frames(controls_frame, self.graph, self.param_vars,
+                                               self.on_param_change)
+        
+        # Botón de salida centrado al final
+        self.exit_frame = ttk.Frame(controls_frame)
+        self.exit_frame.pack(fill=tk.X, pady=10)
+        self.compare_button = ttk.Button(self.exit_frame, text="Comparar modos", command=self.toggle_compare)
+        self.compare_button.pack(pady=(0, 5))
+        if self.pipeline is not None or self.workers_requested:
+            # Los workers y el proceso de filtro calculan un solo modo fuera de process_frame
+            self.compare_button.state(["disabled"])
+        self.freeze_button = ttk.Button(self.exit_frame, text="Congelar", command=self.toggle_freeze)
+        self.freeze_button.pack(pady=(0, 5))
+        if self.pipeline is not None or self.multi is not None:
+            # En modo multiproceso la captura corre en otro proceso y no se puede congelar;
+            # con varias fuentes no hay un único frame que congelar
+            self.freeze_button.state(["disabled"])
+        self.trace_button = ttk.Button(self.exit_frame, text="Iniciar traza", command=self.toggle_trace)
+        self.trace_button.pack(pady=(0, 5))
+        ttk.Button(self.exit_frame, text="Guardar traza", command=self.save_trace).pack(pady=(0, 5))
+        self.record_button = ttk.Button(self.exit_frame, text="Grabar", command=self.toggle_recording)
+        self.record_button.pack(pady=(0, 5))
+        ttk.Button(self.exit_frame, text="Salir", command=self.on_closing).pack()
+        
+        # Inicializar visibilidad de frames
+        self.update_controls_visibility()
+        self.update_mode_description()
+        
+    def adjust_window_size(self):
+        """Ajusta el tamaño de la ventana al tamaño de la imagen más los controles"""
+        # Actualizar la ventana para obtener el tamaño real de los controles
+        self.root.update_idletasks()
+        
+        # Obtener dimensiones de la pantalla
+        screen_width = self.root.winfo_screenwidth()
+        screen_height = self.root.winfo_screenheight()
+        
+        # Calcular el tamaño total de la ventana
+        # Agregar padding y espacio para los controles
+        padding_h = 40  # padding horizontal
+        padding_v = 60  # padding vertical
+        total_width = self.camera_width + padding_h + 20  # +20 para scrollbar
+        total_height = int(screen_height * 0.9)  # Usar 90% de la altura de pantalla para permitir scroll
+        
+        # Limitar ancho máximo de pantalla si es necesario
+        max_width = int(screen_width * 0.9)
+        
+        if total_width > max_width:
+            # Calcular escala para el ancho
+            scale = max_width / total_width
+            self.display_width = int(self.camera_width * scale)
+            self.display_height = int(self.camera_height * scale)
+            total_width = max_width
+        else:
+            self.display_width = self.camera_width
+            self.display_height = self.camera_height
+        
+        # Establecer geometría de la ventana
+        self.root.geometry(f"{total_width}x{total_height}")
+        self.root.minsize(total_width, 400)  # Altura mínima razonable
+        
+        # Actualizar scrollregion después de ajustar tamaño
+        self.root.after(100, lambda: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        
+    def set_mode(self, mode):
+        self.mode = mode
+        self.params.publish(mode=mode)
+        self.update_controls_visibility()
+        self.update_mode_description()
+        self.request_render()
+        
+    def update_mode_description(self):
+        """Actualiza la descripción del modo actual"""
+        description = self.graph.modes[self.mode].get("description", "")
+        self.mode_description_label.config(text=description)
+        
+    def update_controls_visibility(self):
+        # Mostrar/ocultar frames de parámetros según el modo
+        groups = self.graph.mode_groups(self.mode)
+        for group, frame in self.param_frames.items():
+            if group in groups:
+                frame.pack(fill=tk.X, pady=5, before=self.exit_frame)
+            else:
+                frame.pack_forget()
+        
+        # Actualizar scrollregion después de cambiar visibilidad
+        self.root.after(10, lambda: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+            
+    def on_param_change(self, name, value):
+        """Ajusta el valor del control al tipo del parámetro y publica el snapshot nuevo"""
+        param = self.graph.param_map[name]
+        coerced = param.coerce(value)
+        if coerced != self.param_vars[name].get():
+            self.param_vars[name].set(coerced)
+        self.params.publish(**{name: coerced})
+        self.request_render()
+        
+    def toggle_freeze(self):
+        """Congela el último frame (deja de leer la fuente) o reanuda la captura"""
+        if self.pipeline is not None or self.multi is not None:
+            return
+        if self.frozen is None:
+            frame, _, _ = self.grabber.read_latest()
+            self.grabber.pause()
+            self.frozen = FrozenFrame(self.graph, frame)
+            self.freeze_button.config(text="Reanudar")
+            self.render_frozen()
+        else:
+            self.frozen = None
+            if self.memo is not None:
+                # Lo que está en pantalla ya no corresponde al último frame procesado
+                self.memo.invalidate()
+            self.grabber.resume()
+            self.freeze_button.config(text="Congelar")
+        
+    def toggle_compare(self):
+        """Alterna entre el modo seleccionado y la grilla con todos los modos"""
+        if self.pipeline is not None or self.workers_requested:
+            return
+        self.comparing = not self.comparing
+        self.compare_button.config(text="Un solo modo" if self.comparing else "Comparar modos")
+        self.request_render()
+        
+    def comparison_size(self):
+        """Tamaño del mosaico de comparación: el que ocupa en pantalla"""
+        if self.multi is not None:
+            return self.multi.tile_width, self.multi.tile_height
+        return self.display_width, self.display_height
+        
+    def request_render(self):
+        """Recalcula el frame congelado cuando Tk quede libre (agrupa los movimientos de un slider)"""
+        if self.frozen is not None and not self.render_pending:
+            self.render_pending = True
+            self.root.after_idle(self.render_frozen)
+        
+    def render_frozen(self):
+        """Muestra el frame congelado con los parámetros actuales"""
+        self.render_pending = False
+        if self.frozen is None:
+            return
+        params = self.get_params()
+        process_start = time.perf_counter()
+        if self.comparing:
+            # Solo se recalculan los nodos afectados, para todos los modos a la vez
+            results = self.frozen.run(params, self.comparison.outputs)
+            processed = self.comparison.compose(self.frozen.frame, results, self.frozen.pool,
+                                                self.comparison_size())
+        else:
+            processed = self.frozen.process(params)
+        self.show_result(processed, params, time.perf_counter() - process_start)
+        
+    def toggle_trace(self):
+        """Activa el trazado (vacía el anillo) o lo detiene"""
+        if not self.tracer.enabled:
+            self.tracer.clear()
+            self.last_update_end = None
+            self.tracer.enabled = True
+            if self.profiler is not None:
+                self.profiler.start()
+            self.trace_button.config(text="Detener traza")
+        else:
+            self.tracer.enabled = False
+            if self.profiler is not None:
+                self.profiler.stop()
+            self.trace_button.config(text="Iniciar traza")
+        
+    def save_trace(self, reason="manual"):
+        """Guarda el anillo de eventos como traza de Chrome / Perfetto en trace_dir"""
+        name = f"traza_{self.graph.name}_{time.strftime('%Y%m%d-%H%M%S')}_{reason}.json"
+        path = os.path.join(self.trace_dir, name)
+        metadata = {"reason": reason, "fps": self.stats.fps(), "params": dict(self.get_params().items())}
+        if self.profiler is not None:
+            metadata["samples"] = self.profiler.top()
+        count = self.tracer.dump_async(path, metadata)
+        print(f"Traza guardada en {path} ({count} eventos)")
+        
+    def toggle_recording(self):
+        """Empieza a grabar el video procesado en record_dir o cierra la grabación en curso"""
+        if self.recorder is None:
+            name = f"grabacion_{self.graph.name}_{time.strftime('%Y%m%d-%H%M%S')}{self.record_format}"
+            self.recorder = Recorder(os.path.join(self.record_dir, name), self.record_fps, stats=self.stats,
+                                     **self.record_options)
+            self.record_button.config(text="Detener grabación")
+        else:
+            recorder, self.recorder = self.recorder, None
+            # close espera a que se escriba lo que quedó en la cola
+            recorder.close()
+            report = recorder.report()
+            print(f"Grabación: {report['written']} frames en {report['segments']} archivo(s), "
+                  f"{report['dropped']} descartados ({', '.join(recorder.paths)})")
+            if report["error"] is not None:
+                print(f"La grabación se detuvo por un error: {report['error']}")
+            self.record_button.config(text="Grabar")
+        
+    def record_frame(self, processed):
+        """Envía el frame a la grabación; si el codificador falló, la cierra e informa"""
+        self.recorder.submit(processed)
+        if self.recorder.error is not None:
+            self.toggle_recording()
+        
+    def get_params(self):
+        """Snapshot actual de los parámetros (se puede leer desde cualquier hilo)"""
+        return self.params.snapshot
+        
+    def refresh_gauges(self):
+        """Toma los valores instantáneos para la exportación de métricas, en el hilo de Tk"""
+        gauges = {"buffer_pool_bytes": self.pool.nbytes, "buffer_pool_buffers": len(self.pool.buffers),
+                  "frozen": int(self.frozen is not None)}
+        if self.governor is not None:
+            gauges["working_scale"] = self.governor.scale
+        if self.workers is not None:
+            gauges["workers_in_flight"] = self.workers.in_flight
+        if self.memo is not None:
+            gauges["memo_hit_ratio"] = self.memo.hit_rate
+        recorder = self.recorder
+        if recorder is not None:
+            report = recorder.report()
+            gauges["record_backlog"] = report["backlog"]
+            gauges["record_encode_fps"] = report["encode_fps"]
+        # Reemplazar la referencia es atómico: los hilos de métricas nunca ven un diccionario a medias
+        self.gauges = gauges
+        if self.is_running:
+            self.root.after(500, self.refresh_gauges)
+        
+    def metric_gauges(self):
+        """Últimos valores tomados por refresh_gauges (se llama desde los hilos de métricas)"""
+        return self.gauges
+        
+    def process_frame(self, frame, params=None, pool=None):
+        """Procesa el frame según el modo actual"""
+        if params is None:
+            params = self.get_params()
+        if pool is None:
+            pool = self.pool
+        if self.comparing:
+            return self.comparison.process(frame, params, pool, self.tiler, self.comparison_size())
+        if self.tiler is not None:
+            return self.tiler.process(frame, params, pool)
+        return self.graph.process(frame, params, pool)
+        
+    def update_frame(self):
+        """Actualiza el frame del video (con el trazado activo, registra la vuelta y la espera de Tk)"""
+        if not self.tracer.enabled:
+            self.update_frame_step()
+            return
+        start = time.perf_counter_ns()
+        if self.last_update_end is not None:
+            # Entre dos vueltas Tk atiende eventos, redibuja y espera el after
+            self.tracer.complete("tk_idle", self.last_update_end, start - self.last_update_end)
+        self.update_frame_step()
+        end = time.perf_counter_ns()
+        self.tracer.complete("update_frame", start, end - start)
+        self.last_update_end = end
+        
+    def update_frame_step(self):
+        """Una vuelta del ciclo: toma el último frame, lo procesa y lo muestra"""
+        if not self.is_running:
+            return
+        
+        if self.pipeline is not None:
+            self.update_from_pipeline()
+            self.root.after(1, self.update_frame)
+            return
+        
+        if self.multi is not None:
+            self.update_multi()
+            self.root.after(1, self.update_frame)
+            return
+        
+        if self.frozen is not None:
+            # Captura detenida: solo se vuelve a dibujar al mover un control (request_render)
+            if self.workers is not None:
+                # Descartar los resultados de frames anteriores al congelado
+                self.workers.collect()
+            self.root.after(50, self.update_frame)
+            return
+            
+        # Tomar el frame más reciente sin esperar a la cámara
+        frame, sequence, timestamp = self.grabber.read_latest()
+        if sequence != self.last_sequence:
+            self.last_sequence = sequence
+            # Un solo snapshot por frame: proceso y título usan los mismos valores
+            params = self.get_params()
+            
+            # Un frame repetido con los mismos parámetros ya está en pantalla: no se procesa
+            scale = self.governor.scale if self.governor is not None else 1.0
+            hit = self.memo.lookup(frame, params, scale, self.comparing) if self.memo is not None else None
+            if hit is None:
+                self.process_new_frame(frame, sequence, params)
+            elif hit[0] is not None:
+                self.repeat_result(hit[0])
+        
+        if self.workers is not None:
+            # Los resultados llegan en orden; si hay varios listos solo se muestra el último
+            ready = self.workers.collect()
+            if ready:
+                sequence, processed, params, process_time = ready[-1]
+                processed_rgb = self.show_result(processed, params, process_time)
+                if self.memo is not None and sequence == self.memo_sequence:
+                    # Resultado del último frame guardado en el caché: lo reutilizan los aciertos
+                    self.memo.fill(processed, processed_rgb)
+        
+        # Programar próxima actualización (solo cede el control a Tk)
+        self.root.after(1, self.update_frame)
+        
+    def process_new_frame(self, frame, sequence, params):
+        """Procesa el frame (o lo envía a los workers) y muestra el resultado"""
+        # En modo adaptativo, reducir primero a la resolución de trabajo
+        self.resize_time = 0.0
+        if self.governor is not None:
+            resize_start = time.perf_counter()
+            frame = self.governor.resize(frame, self.pool)
+            self.resize_time = time.perf_counter() - resize_start
+        
+        if self.workers is not None:
+            # El frame es un buffer reutilizado (grabber o pool): el worker necesita una copia.
+            # Si la cola está llena el frame se descarta y se sigue con el siguiente.
+            submitted = self.workers.submit(frame.copy(), sequence, params)
+            if not submitted:
+                self.stats.count("worker_dropped")
+            elif self.memo is not None:
+                self.memo.store()
+                self.memo_sequence = sequence
+        else:
+            # Procesar frame
+            process_start = time.perf_counter()
+            processed = self.process_frame(frame, params)
+            processed_rgb = self.show_result(processed, params, time.perf_counter() - process_start)
+            if self.memo is not None:
+                self.memo.store(processed, processed_rgb)
+        
+    def repeat_result(self, processed):
+        """Cuenta y graba como frame nuevo un resultado reutilizado del caché (ya en pantalla)"""
+        if self.recorder is not None:
+            self.record_frame(processed)
+        self.stats.tick()
+        if self.trace_trigger is not None and self.tracer.enabled and self.trace_trigger.check():
+            self.save_trace("caida_fps")
+        
+    def update_multi(self):
+        """Procesa las fuentes con frame nuevo (repartiendo el presupuesto) y muestra el mosaico"""
+        params = self.get_params()
+        
+        def process(frame, pool):
+            if self.governor is not None:
+                frame = self.governor.resize(frame, pool)
+            return self.process_frame(frame, params, pool)
+        
+        # Con --target-fps cada vuelta tiene el presupuesto de un frame; sin él se atienden todas
+        budget = self.governor.frame_budget if self.governor is not None else 0.0
+        served, _, process_time = self.multi.step(process, budget)
+        if served:
+            self.show_result(self.multi.mosaic, params, process_time)
+        
+    def update_from_pipeline(self):
+        """Muestra el último resultado del proceso de filtro (modo multiproceso)"""
+        self.pipeline.set_params(self.get_params())
+        result = self.pipeline.latest()
+        if result is None:
+            return
+        processed, sequence, params, process_time, slot = result
+        self.last_sequence = sequence
+        self.show_result(processed, params, process_time)
+        # show_result ya copió el resultado a los buffers de visualización
+        del processed
+        self.pipeline.release(slot)
+        if self.governor is not None:
+            self.pipeline.set_scale(self.governor.scale)
+        
+    def show_result(self, processed, params, process_time):
+        """Muestra un frame procesado y actualiza el título. Devuelve la imagen RGB mostrada"""
+        # Con workers o procesos la medición viene de otro hilo: no se sabe cuándo ocurrió
+        self.stats.record("process", process_time, trace=self.workers is None and self.pipeline is None)
+        
+        # Redimensionar al tamaño de visualización y convertir a RGB para tkinter
+        display_start = time.perf_counter()
+        processed_rgb = prepare_display(processed, self.display_width, self.display_height, self.pool,
+                                        self.stats)
+        if self.overlay:
+            draw_overlay(processed_rgb, self.stats.overlay_lines())
+        
+        # Actualizar la imagen del label (se reutiliza el mismo PhotoImage)
+        self.display_sink.show(processed_rgb)
+        display_time = time.perf_counter() - display_start
+        if self.recorder is not None:
+            self.record_frame(processed)
+        self.stats.tick()
+        if self.trace_trigger is not None and self.tracer.enabled and self.trace_trigger.check():
+            self.save_trace("caida_fps")
+        
+        # Agregar texto con el modo actual
+        mode = params["mode"]
+        mode_text = f"Modo: {mode.upper()}"
+        modes = [mode]
+        if self.comparing:
+            mode_text = f"Comparación: {', '.join(self.comparison.modes)}"
+            modes = self.comparison.modes
+        shown = set()
+        for name in modes:
+            for param in self.graph.mode_params(name):
+                if param.title and param.name not in shown:
+                    shown.add(param.name)
+                    mode_text += f" | {param.title}: {param.display(params[param.name])}"
+        
+        mode_text += (f" | Proceso: {process_time * 1000:.1f} ms"
+                      f" | Display: {self.display_sink.last_cost * 1000:.1f} ms")
+        if self.workers is not None:
+            stats = self.workers.stats()
+            usage = sum(stats["utilization"].values()) / stats["workers"]
+            mode_text += (f" | Workers: {stats['workers']} | Cola: {stats['in_flight']}/{stats['depth']}"
+                          f" | Uso: {usage:.0%} | Descartados: {stats['dropped']}")
+            # Con varios workers en paralelo cada uno dispone de workers × el presupuesto del frame
+            process_time /= stats["workers"]
+        if self.pipeline is not None:
+            stats = self.pipeline.stats()
+            mode_text += (f" | Slots libres: {stats['input_free']}/{stats['output_free']}"
+                          f" | Descartados: {stats['capture_dropped']}")
+            if stats["oversized"]:
+                mode_text += f" | Sin lugar en la salida: {stats['oversized']}"
+        if self.multi is not None:
+            fps = " / ".join(f"{value:.0f}" for value in self.multi.fps())
+            mode_text += f" | Fuentes: {len(self.multi.slots)} ({fps} FPS) | Postergadas: {self.multi.skipped()}"
+        if self.memo is not None:
+            mode_text += f" | Caché: {self.memo.hit_rate:.0%}"
+        if self.recorder is not None:
+            report = self.recorder.report()
+            mode_text += (f" | Grabando: {report['written']} | Cola: {report['backlog']}/{report['capacity']}"
+                          f" | Codificación: {report['encode_fps']:.0f} FPS | Descartados: {report['dropped']}")
+        if self.frozen is not None:
+            mode_text += f" | Congelado (recalculado: {', '.join(self.frozen.recomputed) or 'nada'})"
+        elif self.governor is not None:
+            height, width = processed.shape[:2]
+            mode_text += f" | Escala: {self.governor.scale:.2f} ({width}x{height})"
+            self.governor.update(process_time, self.resize_time + display_time)
+        
+        # Mostrar información en la ventana
+        self.root.title(f"{self.title} - {mode_text}")
+        return processed_rgb
+        
+    def on_closing(self):
+        """Maneja el cierre de la aplicación"""
+        self.is_running = False
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        elif self.multi is not None:
+            self.multi.close()
+        else:
+            self.grabber.stop()
+        if self.workers is not None:
+            self.workers.close()
+        if self.tiler is not None:
+            self.tiler.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        if self.profiler is not None:
+            self.profiler.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.root.destroy()
+
+def main(graph, title, description):
+    """Punto de entrada de los scripts: graph es el grafo por defecto (--graph lo reemplaza)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--source", default="0",
+                        help="Fuente de video: índice de cámara, archivo, carpeta de imágenes o synthetic:WxH@fps")
+    parser.add_argument("--sources", nargs="+", metavar="URI",
+                        help="Varias fuentes a la vez, cada una con su hilo de captura, en mosaico")
+    parser.add_argument("--target-fps", type=float, default=0,
+                        help="Modo adaptativo: baja la resolución de procesamiento para alcanzar estos FPS")
+    parser.add_argument("--graph", help="Archivo JSON con un grafo de filtros propio (ver graphs/)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Procesar en N hilos o procesos (0 = en el hilo de la interfaz)")
+    parser.add_argument("--backend", choices=BACKENDS, default="thread", help="Tipo de worker para --workers")
+    parser.add_argument("--depth", type=int, default=0,
+                        help="Frames en vuelo como máximo; si se llena se descartan (por defecto 2 × workers)")
+    parser.add_argument("--tiles", type=int, default=0,
+                        help="Dividir cada frame en N franjas procesadas en paralelo (menor latencia)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Captura, filtros e interfaz en procesos separados (memoria compartida)")
+    parser.add_argument("--memo", action="store_true",
+                        help="No reprocesar frames repetidos si los parámetros no cambiaron")
+    parser.add_argument("--stats-overlay", action="store_true",
+                        help="Dibujar sobre el video los FPS y los percentiles de tiempo de cada etapa")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Servir métricas en formato Prometheus en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument("--metrics-jsonl", help="Agregar periódicamente las métricas y parámetros a este archivo")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="Segundos entre registros de --metrics-jsonl")
+    parser.add_argument("--trace", action="store_true",
+                        help="Iniciar con el trazado por frame activo (también con el botón Iniciar traza)")
+    parser.add_argument("--trace-fps", type=float, default=0,
+                        help="Con el trazado activo, guardar la traza si los FPS recientes caen bajo este valor")
+    parser.add_argument("--trace-dir", default=".", help="Carpeta donde se guardan las trazas")
+    parser.add_argument("--trace-sample-ms", type=float, default=0,
+                        help="Muestrear la pila del hilo de la interfaz cada N ms y agregarla a la traza")
+    parser.add_argument("--record", action="store_true",
+                        help="Iniciar grabando el video procesado (también con el botón Grabar)")
+    parser.add_argument("--record-dir", default=".", help="Carpeta donde se guardan las grabaciones")
+    parser.add_argument("--record-format", choices=sorted(VIDEO_EXTENSIONS), default=".mp4",
+                        help="Contenedor de las grabaciones")
+    parser.add_argument("--record-fps", type=float, default=0,
+                        help="FPS del video grabado (por defecto --target-fps o los de la fuente)")
+    parser.add_argument("--record-policy", choices=POLICIES, default="drop",
+                        help="Con la cola llena: descartar el frame (drop) o esperar al codificador (block)")
+    parser.add_argument("--record-queue", type=int, default=32, help="Frames que puede acumular la cola de grabación")
+    parser.add_argument("--record-segment-seconds", type=float, default=0,
+                        help="Empezar un archivo nuevo cada N segundos (0 = un solo archivo)")
+    parser.add_argument("--record-segment-mb", type=float, default=0,
+                        help="Empezar un archivo nuevo al superar N megabytes (0 = sin límite)")
+    parser.add_argument("--record-software", action="store_true",
+                        help="No intentar codificar por hardware")
+    parser.add_argument("--compare", action="store_true",
+                        help="Iniciar con la grilla que muestra todos los modos a la vez. El frame se reduce "
+                             "una sola vez al tamaño de una celda y todos los modos se calculan sobre esa "
+                             "versión: con 4 modos cuesta menos de la mitad que mostrarlos por separado")
+    parser.add_argument("--compare-full", action="store_true",
+                        help="En la grilla, calcular cada modo a resolución completa (kernels y umbrales como en "
+                             "un solo modo; cuesta casi lo mismo que la suma de los modos)")
+    parser.add_argument("--dump-frames", metavar="ARCHIVO.vfs",
+                        help="Guardar los frames capturados sin comprimir (repetir con --source ARCHIVO.vfs); "
+                             "si cambia la resolución se sigue en ARCHIVO_001.vfs, ARCHIVO_002.vfs...")
+    args = parser.parse_args()
+    if args.processes and args.workers:
+        parser.error("--processes y --workers no se pueden combinar")
+    if args.workers and args.tiles > 1:
+        parser.error("--workers y --tiles no se pueden combinar")
+    if args.processes and args.memo:
+        parser.error("--processes y --memo no se pueden combinar")
+    if args.processes and args.dump_frames:
+        parser.error("--processes y --dump-frames no se pueden combinar")
+    if args.compare and (args.processes or args.workers):
+        parser.error("--compare no se puede combinar con --processes ni --workers")
+    if args.sources:
+        for option in ("processes", "workers", "memo", "dump_frames"):
+            if getattr(args, option):
+                parser.error(f"--sources y --{option.replace('_', '-')} no se pueden combinar")
+    
+    record_options = {"policy": args.record_policy, "queue_size": args.record_queue,
+                      "segment_seconds": args.record_segment_seconds, "segment_mb": args.record_segment_mb,
+                      "hardware": not args.record_software}
+    
+    root = tk.Tk()
+    if args.graph:
+        graph = load_graph(args.graph)
+    app = RealtimeApp(root, graph, title, source_uri=args.source, target_fps=args.target_fps,
+                      workers=args.workers, backend=args.backend, depth=args.depth,
+                      processes=args.processes, tiles=args.tiles, memo=args.memo, overlay=args.stats_overlay,
+                      metrics_port=args.metrics_port, metrics_jsonl=args.metrics_jsonl,
+                      metrics_interval=args.metrics_interval,
+                      trace=args.trace, trace_fps=args.trace_fps, trace_dir=args.trace_dir,
+                      trace_sample_ms=args.trace_sample_ms,
+                      record=args.record, record_dir=args.record_dir, record_format=args.record_format,
+                      record_fps=args.record_fps, record_options=record_options,
+                      dump_frames=args.dump_frames, sources=args.sources,
+                      compare=args.compare, compare_full=args.compare_full)
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.mainloop()
+
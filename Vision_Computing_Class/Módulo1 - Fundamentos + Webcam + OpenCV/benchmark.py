@@ -0,0 +1,196 @@
+"""Benchmark de todos los modos de process_frame.
+
+Mide cada modo de la aplicación en tiempo real (app.py) sobre frames
+sintéticos en varias resoluciones, recorriendo los rangos de los sliders
+de la interfaz. Reporta percentiles de latencia por etapa (procesamiento y
+preparación para mostrar: redimensionado + conversión a RGB) y throughput
+en JSON.
+
+Con --input se mide sobre los frames de un archivo .vfs (framestore.py) en
+lugar de frames sintéticos: la misma entrada bit a bit en cada corrida,
+leída por memmap sin decodificar.
+
+Ejemplos:
+    python benchmark.py --output resultados.json
+    python benchmark.py --quick --resolutions 720p,1080p --modes canny,sobel
+    python benchmark.py --input captura.vfs --quick
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from buffers import BufferPool
+from display import prepare_display
+from framestore import FrameStore
+from graph import EDGE_GRAPH, FILTER_GRAPH, default_params, process
+from processing import BLUR_ENGINES, SOBEL_ENGINES, THRESHOLD_TYPES
+from sources import SyntheticSource
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+ALL_MODES = tuple(EDGE_GRAPH.modes) + tuple(FILTER_GRAPH.modes)
+
+
+def parameter_sweep(mode, quick=False):
+    """Combinaciones de parámetros a medir para cada modo (rangos de los sliders)"""
+    if mode == "canny":
+        pairs = [(50, 150)] if quick else [(0, 50), (50, 150), (100, 200), (200, 255)]
+        for t1, t2 in pairs:
+            yield {"canny_threshold1": t1, "canny_threshold2": t2}
+    elif mode == "sobel":
+        for engine in SOBEL_ENGINES:
+            for kernel in ((3, 7) if quick else (1, 3, 5, 7)):
+                yield {"sobel_kernel": kernel, "sobel_engine": engine}
+    elif mode == "binary":
+        for threshold_type in (("BINARY",) if quick else THRESHOLD_TYPES):
+            yield {"threshold_type": threshold_type}
+    elif mode in ("blur", "binary_blur"):
+        kernels = (3, 31) if quick else (1, 3, 5, 9, 15, 21, 31)
+        sigmas = (0.0,) if quick else (0.0, 10.0)
+        for engine in (("auto",) if quick else BLUR_ENGINES):
+            for kernel in kernels:
+                for sigma in sigmas:
+                    yield {"blur_kernel_size": kernel, "blur_sigma_x": sigma, "blur_engine": engine}
+    else:
+        yield {}
+
+
+def percentiles(samples_ns):
+    """Resumen de latencias en milisegundos"""
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p90_ms": round(float(p90), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def display_size(width, height, max_width):
+    """Tamaño de visualización con la misma regla que adjust_window_size"""
+    if width <= max_width:
+        return width, height
+    scale = max_width / width
+    return int(width * scale), int(height * scale)
+
+
+def measure(frames, params, display, warmup, count):
+    """Mide las etapas de update_frame (sin captura ni Tk) para un caso"""
+    stages = {"process": [], "display_prep": [], "total": []}
+    output_dtype = None
+    pool = BufferPool()
+    for i in range(warmup + count):
+        frame = frames[i % len(frames)]
+        t0 = time.perf_counter_ns()
+        processed = process(frame, params, pool)
+        t1 = time.perf_counter_ns()
+        prepare_display(processed, display[0], display[1], pool)
+        t2 = time.perf_counter_ns()
+        if i >= warmup:
+            stages["process"].append(t1 - t0)
+            stages["display_prep"].append(t2 - t1)
+            stages["total"].append(t2 - t0)
+        output_dtype = str(processed.dtype)
+    summary = {name: percentiles(samples) for name, samples in stages.items()}
+    return summary, output_dtype
+
+
+def environment():
+    """Información de la máquina para poder comparar resultados"""
+    return {
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "opencv_threads": cv2.getNumThreads(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los modos de procesamiento")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS),
+                        help="Lista separada por comas: " + ", ".join(RESOLUTIONS))
+    parser.add_argument("--modes", default=",".join(ALL_MODES), help="Lista separada por comas")
+    parser.add_argument("--frames", type=int, default=30, help="Frames medidos por caso")
+    parser.add_argument("--warmup", type=int, default=3, help="Frames descartados antes de medir")
+    parser.add_argument("--display-width", type=int, default=1280,
+                        help="Ancho máximo de visualización para la etapa display_prep")
+    parser.add_argument("--quick", action="store_true", help="Recorrido reducido de parámetros")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--input", help="Archivo .vfs con los frames a medir (reemplaza --resolutions)")
+    args = parser.parse_args()
+
+    resolutions = [r.strip() for r in args.resolutions.split(",") if r.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    for name in resolutions:
+        if name not in RESOLUTIONS:
+            parser.error(f"Resolución desconocida: {name}")
+    for mode in modes:
+        if mode not in ALL_MODES:
+            parser.error(f"Modo desconocido: {mode}")
+
+    cases = []
+    if args.input:
+        store = FrameStore(args.input)
+        if len(store) == 0:
+            parser.error(f"{args.input} no tiene frames")
+        if store.channels != 3:
+            parser.error("Los modos esperan frames BGR de 3 canales")
+        # Vistas del archivo: cada caso recorre los mismos frames sin copiarlos
+        cases.append((os.path.basename(args.input), store.width, store.height, store))
+    for name in ([] if args.input else resolutions):
+        width, height = RESOLUTIONS[name]
+        source = SyntheticSource(width, height, realtime=False)
+        # Varios frames distintos para no medir siempre la misma imagen
+        cases.append((name, width, height, [source.read()[1] for _ in range(4)]))
+
+    results = []
+    for name, width, height, frames in cases:
+        display = display_size(width, height, args.display_width)
+        for mode in modes:
+            for overrides in parameter_sweep(mode, args.quick):
+                params = default_params()
+                params.update(overrides)
+                params["mode"] = mode
+                stages, output_dtype = measure(frames, params, display, args.warmup, args.frames)
+                results.append({
+                    "mode": mode,
+                    "resolution": name,
+                    "width": width,
+                    "height": height,
+                    "params": overrides,
+                    "output_dtype": output_dtype,
+                    "frames": args.frames,
+                    "stages": stages,
+                    "fps": round(1000.0 / stages["total"]["mean_ms"], 2),
+                })
+                print(f"{name:>6} {mode:<12} {json.dumps(overrides):<55} "
+                      f"{stages['total']['p50_ms']:8.2f} ms", file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Blur Gaussiano con kernels en caché y aproximaciones más baratas.
+
+Motores:
+    opencv     cv2.GaussianBlur, la referencia
+    separable  kernel 1D en caché aplicado con cv2.sepFilter2D; las colas
+               del kernel que no cambian el resultado en 8 bits se recortan
+    pyramid    cv2.pyrDown, un kernel corto a media resolución y cv2.pyrUp;
+               trabaja sobre un cuarto de los píxeles, así que con kernels
+               grandes cuesta bastante menos que separable
+    box        cascada de hasta tres filtros de caja (cv2.blur); su costo
+               casi no depende del tamaño del kernel, pero es una
+               aproximación: se elige a mano
+    auto       pyramid cuando el kernel es grande y su cota de error no
+               pasa de MAX_ERROR_LEVELS niveles de gris, box con la misma
+               condición, separable en los demás casos
+
+Los kernels, las cascadas y los ajustes de pyramid se calculan una vez por
+(ksize, sigma), es decir cuando se mueve un slider, y se guardan en un
+caché LRU.
+
+Cota de error de box: si k es el kernel Gaussiano 1D y b el de la cascada,
+el kernel 2D difiere en norma L1 como mucho 2·|b - k|₁, así que ningún
+píxel de salida difiere del blur exacto en más de
+    255 · 2 · |b - k|₁ + 0.5 · pasadas
+niveles de gris (el último término es el redondeo a 8 bits de cada
+pasada). Con kernels de uso habitual la cascada de tres cajas se aleja
+bastante más de MAX_ERROR_LEVELS (el error máximo medido llega a 15-17
+niveles en bordes marcados), así que auto casi nunca la elige.
+
+Cota de error de pyramid: pyrDown, el kernel h de media resolución y pyrUp
+equivalen a un kernel de resolución completa distinto para filas (y
+columnas) pares e impares. h se ajusta por mínimos cuadrados para que esos
+kernels se parezcan al Gaussiano g, y el error queda acotado por
+    255 · máx ½·|kᵢ ⊗ kⱼ - g ⊗ g|₁ + 0.5 · |h|₁² + 0.5 + 1 / PYRAMID_SCALE
+(diferencia de kernels en el peor par de fases, redondeo de pyrDown
+filtrado por h, redondeo final a 8 bits y redondeo de los pasos en int16).
+Se usa el h más corto que cumple la cota. Solo se puede cumplir si el
+kernel es de verdad Gaussiano y ancho: con ksize 21-31 y sigma 0 (el
+automático) o sigma de hasta ~ksize / 7; un kernel truncado (sigma grande
+para su ksize) o angosto no lo admite y auto usa separable. python blur.py
+muestra qué motor elige auto en cada caso, las cotas, el error medido y
+los tiempos.
+"""
+import argparse
+import itertools
+import time
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from buffers import pool_buffer
+
+BLUR_ENGINES = ("auto", "opencv", "separable", "pyramid", "box")
+
+# Con menos coeficientes que esto sepFilter2D es más rápido que la cascada
+BOX_MIN_TAPS = 11
+# Con menos coeficientes que esto sepFilter2D es más rápido que pyramid
+PYRAMID_MIN_TAPS = 19
+# Cota de error máxima (niveles de gris) para que auto elija una aproximación
+MAX_ERROR_LEVELS = 2.0
+# Escala del resultado intermedio de pyramid en int16 (6 bits de fracción)
+PYRAMID_SCALE = 64
+# Kernel 1D de cv2.pyrDown; cv2.pyrUp usa el doble sobre las muestras intercaladas
+PYRAMID_KERNEL = np.array([1, 4, 6, 4, 1]) / 16
+# Masa total de las colas que se puede recortar (medio nivel de gris sobre 255)
+TAIL_MASS = 0.5 / 255
+
+
+def _reference_kernel(ksize, sigma):
+    """Kernel 1D de cv2.GaussianBlur en doble precisión"""
+    return cv2.getGaussianKernel(ksize, sigma, ktype=cv2.CV_64F).ravel()
+
+
+@lru_cache(maxsize=64)
+def gaussian_kernel(ksize, sigma):
+    """Kernel 1D normalizado (float32) sin las colas que no afectan el resultado"""
+    kernel = _reference_kernel(ksize, sigma)
+    radius = ksize // 2
+    # Recortar mientras la masa de ambas colas quede por debajo de TAIL_MASS
+    while radius > 0 and 2 * kernel[:ksize // 2 - radius + 1].sum() <= TAIL_MASS:
+        radius -= 1
+    kernel = kernel[ksize // 2 - radius:ksize // 2 + radius + 1]
+    kernel = (kernel / kernel.sum()).astype(np.float32).reshape(-1, 1)
+    kernel.flags.writeable = False  # Compartido por todos los que lo piden
+    return kernel
+
+
+def _box_kernel(radii, ksize):
+    """Kernel 1D equivalente a una cascada de cajas, centrado en ksize coeficientes"""
+    kernel = np.ones(1)
+    for radius in radii:
+        kernel = np.convolve(kernel, np.full(2 * radius + 1, 1.0 / (2 * radius + 1)))
+    padding = (ksize - len(kernel)) // 2
+    return np.pad(kernel, padding)
+
+
+@lru_cache(maxsize=64)
+def box_cascade(ksize, sigma):
+    """Cascada de cajas más parecida al kernel: (radios, distancia L1 entre kernels 1D)
+
+    Se prueban todas las cascadas de 1 a 3 cajas cuyo radio total no supera
+    ksize // 2, así el soporte (y el halo de tiling.py) no cambia.
+    """
+    reference = _reference_kernel(ksize, sigma)
+    best = ((), float(np.abs(_box_kernel((), ksize) - reference).sum()))
+    for passes in (1, 2, 3):
+        for radii in itertools.combinations_with_replacement(range(1, ksize // 2 + 1), passes):
+            if sum(radii) > ksize // 2:
+                continue
+            error = float(np.abs(_box_kernel(radii, ksize) - reference).sum())
+            if error < best[1]:
+                best = (radii, error)
+    return best
+
+
+def error_bound(ksize, sigma):
+    """Diferencia máxima en niveles de gris entre el motor box y el blur exacto"""
+    radii, error = box_cascade(ksize, sigma)
+    return 255 * 2 * error + 0.5 * len(radii)
+
+
+def _phase_kernels(taps, length):
+    """Matrices (length x taps) que llevan h al kernel efectivo de las filas pares e impares
+
+    pyrDown: d[q] = Σ W[t]·x[2q + t - 2]; el kernel: m[i] = Σ h[u]·d[i + u - c];
+    pyrUp: y[j] = Σ 2·W[a]·m[i] con a = j - 2i + 2. Cada coeficiente de h
+    llega al píxel x[j + offset] por todos esos caminos.
+    """
+    center, half = length // 2, taps // 2
+    matrices = []
+    for phase in (0, 1):
+        matrix = np.zeros((length, taps))
+        for a in range(phase % 2, 5, 2):
+            i = (phase + 2 - a) // 2
+            for u in range(taps):
+                for t in range(5):
+                    offset = 2 * (i + u - half) + t - 2 - phase
+                    matrix[center + offset, u] += 2 * PYRAMID_KERNEL[a] * PYRAMID_KERNEL[t]
+        matrices.append(matrix)
+    return matrices
+
+
+@lru_cache(maxsize=64)
+def pyramid_kernel(ksize, sigma):
+    """Kernel h de media resolución para pyramid: (h, cota de error, radio de influencia)
+
+    Se prueba h de 1, 3, 5... coeficientes y se devuelve el primero cuya cota
+    no pasa de MAX_ERROR_LEVELS; si ninguno la cumple, el de menor cota (el
+    motor se puede elegir a mano igual). El radio es el del kernel efectivo
+    más las 2 filas que pyrDown y pyrUp leen del otro lado del borde de una
+    franja (ver blur_radius).
+    """
+    length = 2 * (ksize + 8) + 1
+    reference = np.zeros(length)
+    reference[length // 2 - ksize // 2:length // 2 + ksize // 2 + 1] = _reference_kernel(ksize, sigma)
+    best = None
+    for taps in range(1, ksize + 1, 2):
+        matrices = _phase_kernels(taps, length)
+        h = np.linalg.lstsq(np.vstack(matrices), np.concatenate([reference, reference]), rcond=None)[0]
+        h = (h + h[::-1]) / 2
+        if h.min() < 0:
+            continue  # convertScaleAbs no admite resultados intermedios negativos
+        phases = [matrix @ h for matrix in matrices]
+        mismatch = max(0.5 * np.abs(np.outer(a, b) - np.outer(reference, reference)).sum()
+                       for a in phases for b in phases)
+        bound = 255 * mismatch + 0.5 * h.sum() ** 2 + 0.5 + 1 / PYRAMID_SCALE
+        if best is None or bound < best[1]:
+            support = max(int(np.abs(np.flatnonzero(a) - length // 2).max()) for a in phases)
+            kernel = h.astype(np.float32).reshape(-1, 1)
+            kernel.flags.writeable = False
+            best = (kernel, bound, support + 2)
+        if bound <= MAX_ERROR_LEVELS:
+            break
+    return best
+
+
+def pyramid_bound(ksize, sigma):
+    """Diferencia máxima en niveles de gris entre el motor pyramid y el blur exacto"""
+    return pyramid_kernel(ksize, sigma)[1]
+
+
+def resolve_engine(ksize, sigma, engine="auto"):
+    """Motor que se usa realmente para (ksize, sigma)"""
+    if engine not in BLUR_ENGINES:
+        raise ValueError(f"Motor de blur desconocido: {engine}")
+    if engine != "auto":
+        return engine
+    taps = len(gaussian_kernel(ksize, sigma))
+    if taps >= PYRAMID_MIN_TAPS and pyramid_bound(ksize, sigma) <= MAX_ERROR_LEVELS:
+        return "pyramid"
+    if taps >= BOX_MIN_TAPS and error_bound(ksize, sigma) <= MAX_ERROR_LEVELS:
+        return "box"
+    return "separable"
+
+
+def blur_radius(ksize, sigma, engine="auto"):
+    """Filas vecinas de las que depende cada píxel del resultado (halo de tiling.py)
+
+    pyramid además necesita que la franja empiece en una fila par, para
+    que pyrDown tome los mismos pares de filas que en el frame completo.
+    """
+    if resolve_engine(ksize, sigma, engine) == "pyramid":
+        return pyramid_kernel(ksize, sigma)[2]
+    return ksize // 2
+
+
+def separable_blur(frame, ksize, sigma, pool=None, name="blurred"):
+    """Blur con el kernel 1D en caché en filas y columnas"""
+    kernel = gaussian_kernel(ksize, sigma)
+    return cv2.sepFilter2D(frame, -1, kernel, kernel, dst=pool_buffer(pool, name, frame.shape))
+
+
+def box_blur(frame, ksize, sigma, pool=None, name="blurred"):
+    """Blur aproximado con la cascada de cajas de box_cascade"""
+    radii, _ = box_cascade(ksize, sigma)
+    if not radii:
+        # Sin cajas el resultado es el frame: se copia para no devolver la entrada
+        image = pool_buffer(pool, name, frame.shape, frame.dtype)
+        if image is None:
+            return frame.copy()
+        np.copyto(image, frame)
+        return image
+    image = frame
+    for index, radius in enumerate(radii):
+        # Alternar entre dos buffers de modo que la última pasada quede en name
+        target = name if (len(radii) - 1 - index) % 2 == 0 else name + "_box"
+        image = cv2.blur(image, (2 * radius + 1, 2 * radius + 1),
+                         dst=pool_buffer(pool, target, frame.shape))
+    return image
+
+
+def pyramid_blur(frame, ksize, sigma, pool=None, name="blurred"):
+    """Blur aproximado a media resolución con el kernel de pyramid_kernel
+
+    Abajo y a la derecha se extiende la imagen reducida a mano (reflejo
+    con o sin repetir la última muestra según la dimensión sea par o
+    impar) y se calculan filas y columnas de más, para que el borde
+    coincida con el de cv2.GaussianBlur y el propio borde de pyrUp quede
+    fuera del resultado.
+    """
+    kernel, _, _ = pyramid_kernel(ksize, sigma)
+    height, width = frame.shape[:2]
+    small_shape = ((height + 1) // 2, (width + 1) // 2) + frame.shape[2:]
+    rows, cols = small_shape[0] + 1, small_shape[1] + 1
+    small = cv2.pyrDown(frame, dst=pool_buffer(pool, name + "_down", small_shape))
+    margin = len(kernel) // 2 + 1
+    padded_shape = (small_shape[0] + margin, small_shape[1] + margin) + frame.shape[2:]
+    padded = pool_buffer(pool, name + "_padded", padded_shape)
+    if height % 2 == width % 2:
+        border = cv2.BORDER_REFLECT if height % 2 == 0 else cv2.BORDER_REFLECT_101
+        padded = cv2.copyMakeBorder(small, 0, margin, 0, margin, border, dst=padded)
+    else:
+        # Cada eje con su reflejo: primero filas y después columnas
+        tall = cv2.copyMakeBorder(small, 0, margin, 0, 0,
+                                  cv2.BORDER_REFLECT if height % 2 == 0 else cv2.BORDER_REFLECT_101,
+                                  dst=pool_buffer(pool, name + "_tall", (padded_shape[0],) + small_shape[1:]))
+        padded = cv2.copyMakeBorder(tall, 0, 0, 0, margin,
+                                    cv2.BORDER_REFLECT if width % 2 == 0 else cv2.BORDER_REFLECT_101,
+                                    dst=padded)
+    middle = cv2.sepFilter2D(padded, cv2.CV_16S, kernel * PYRAMID_SCALE, kernel,
+                             dst=pool_buffer(pool, name + "_mid", padded_shape, np.int16))
+    up = cv2.pyrUp(middle[:rows, :cols], dstsize=(2 * cols - 1, 2 * rows - 1),
+                   dst=pool_buffer(pool, name + "_up", (2 * rows - 1, 2 * cols - 1) + frame.shape[2:], np.int16))
+    return cv2.convertScaleAbs(up[:height, :width], alpha=1 / PYRAMID_SCALE,
+                               dst=pool_buffer(pool, name, frame.shape))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cota de error y tiempos de los motores de blur")
+    parser.add_argument("--resolution", default="1920x1080", help="Resolución del frame de prueba (WxH)")
+    parser.add_argument("--frames", type=int, default=10)
+    args = parser.parse_args()
+
+    from buffers import BufferPool
+    from sources import SyntheticSource
+
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+    frame = SyntheticSource(width, height, realtime=False).read()[1]
+    pool = BufferPool()
+    engines = {
+        "opencv": lambda k, s: cv2.GaussianBlur(frame, (k, k), s, dst=pool.get("opencv", frame.shape)),
+        "separable": lambda k, s: separable_blur(frame, k, s, pool, "separable"),
+        "pyramid": lambda k, s: pyramid_blur(frame, k, s, pool, "pyramid"),
+        "box": lambda k, s: box_blur(frame, k, s, pool, "box"),
+    }
+    exact_frame = frame.astype(np.float64)
+    print(" ksize sigma  auto       cota box/pyramid  error máx box/pyramid  "
+          "opencv  separable  pyramid     box (ms)")
+    for ksize in (3, 5, 9, 15, 21, 25, 31):
+        for sigma in (0.0, 2.0, 3.0, 5.0, 10.0):
+            timings = {}
+            for engine, run in engines.items():
+                run(ksize, sigma)
+                start = time.perf_counter()
+                for _ in range(args.frames):
+                    run(ksize, sigma)
+                timings[engine] = (time.perf_counter() - start) / args.frames * 1000
+            # Las cotas son respecto del blur exacto, no del de OpenCV en 8 bits
+            exact = cv2.GaussianBlur(exact_frame, (ksize, ksize), sigma)
+            errors = [np.abs(engines[engine](ksize, sigma) - exact).max() for engine in ("box", "pyramid")]
+            print(f"{ksize:6d} {sigma:5.1f}  {resolve_engine(ksize, sigma):9s}  "
+                  f"{error_bound(ksize, sigma):6.1f} / {pyramid_bound(ksize, sigma):5.1f}  "
+                  f"{errors[0]:10.1f} / {errors[1]:5.1f}     "
+                  f"{timings['opencv']:6.1f}  {timings['separable']:9.1f}  {timings['pyramid']:7.1f}  "
+                  f"{timings['box']:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
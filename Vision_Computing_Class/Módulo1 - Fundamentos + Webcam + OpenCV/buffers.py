@@ -0,0 +1,45 @@
+"""Pool de buffers para el pipeline por frame.
+
+Cada etapa pide su imagen intermedia por nombre y la pasa como dst= a las
+funciones de OpenCV. Mientras la resolución no cambie se reutiliza siempre
+el mismo arreglo, así que en régimen estable no se reserva memoria nueva.
+
+Los buffers se sobrescriben en el siguiente frame: quien necesite conservar
+un resultado debe copiarlo. El pool no es seguro entre hilos; cada hilo
+que procese frames debe tener el suyo.
+"""
+import numpy as np
+
+
+class BufferPool:
+    """Arreglos reutilizables indexados por nombre, forma y tipo de dato"""
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """Devuelve el buffer name con la forma y tipo pedidos, creándolo si hace falta"""
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            # Primera vez o cambió la resolución: se reemplaza el anterior
+            buffer = np.empty(shape, dtype)
+            self.buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+
+    def clear(self):
+        self.buffers.clear()
+
+    @property
+    def nbytes(self):
+        """Memoria total ocupada por los buffers del pool (se puede leer desde otro hilo)"""
+        return sum(buffer.nbytes for buffer in list(self.buffers.values()))
+
+
+def pool_buffer(pool, name, shape, dtype=np.uint8):
+    """Buffer del pool, o None (OpenCV reserva uno nuevo) si no hay pool"""
+    if pool is None:
+        return None
+    return pool.get(name, shape, dtype)
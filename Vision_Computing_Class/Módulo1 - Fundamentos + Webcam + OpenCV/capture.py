@@ -0,0 +1,203 @@
+"""Captura de video en un hilo dedicado.
+
+El hilo lee continuamente de la cámara y guarda los frames en un pequeño
+buffer circular preasignado. Si el consumidor es más lento que la cámara,
+los frames más antiguos se descartan y siempre se entrega el más reciente.
+Con pause el hilo deja de leer de la fuente hasta que se llame a resume.
+Si la fuente sigue abierta pero no entrega frames, el hilo reintenta con
+esperas crecientes y se rinde tras MAX_FAILED_READS fallos seguidos.
+
+Con un objeto Instrumentation se registra la duración de cada lectura
+(etapa capture) y cada frame descartado (contador dropped). Con dump (un
+FrameStoreWriter de framestore.py) cada frame leído se guarda además crudo
+en disco, con su timestamp. Si la resolución cambia, el volcado sigue en un
+segmento nuevo (ver FrameStoreWriter.next_segment); si el disco falla, se
+avisa, se deja de volcar y la captura continúa.
+"""
+import threading
+import time
+
+MAX_FAILED_READS = 50  # Fallos de lectura seguidos antes de dar la fuente por perdida
+MAX_RETRY_DELAY = 0.25  # Espera máxima entre reintentos, en segundos
+
+
+class FrameGrabber:
+    """Lee frames de una fuente de video en su propio hilo"""
+    def __init__(self, cap, buffer_size=3, stats=None, dump=None):
+        if buffer_size < 3:
+            # Un slot con el último frame, uno en uso por el consumidor
+            # y al menos uno libre para escribir
+            raise ValueError("buffer_size debe ser al menos 3")
+        self.cap = cap
+        self.stats = stats
+        self.dump = dump
+        self.buffer_size = buffer_size
+        self.buffers = [None] * buffer_size
+        self.sequences = [0] * buffer_size
+        self.timestamps = [0.0] * buffer_size
+
+        self.condition = threading.Condition()
+        self.latest_slot = None  # Slot con el frame más reciente
+        self.reader_slot = None  # Slot entregado al consumidor
+        self.sequence = 0
+        self.dropped_frames = 0
+        self.failed_reads = 0
+        self.gave_up = False  # La fuente dejó de entregar frames (ver MAX_FAILED_READS)
+        self.released = False
+        self.finished = False
+        self.paused = False
+
+        self.is_running = False
+        self.thread = None
+
+    def start(self):
+        """Lee el primer frame (para dimensionar el buffer) e inicia el hilo"""
+        ret, frame = self.cap.read()
+        if not ret:
+            return False
+        for i in range(self.buffer_size):
+            self.buffers[i] = frame.copy()
+        timestamp = time.monotonic()
+        if self.dump is not None:
+            self.dump.write(frame, timestamp)
+        self._publish(0, timestamp)
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self.thread.start()
+        return True
+
+    def _next_write_slot(self):
+        # El slot libre más antiguo que no sea el último ni el del consumidor
+        candidates = [i for i in range(self.buffer_size)
+                      if i != self.latest_slot and i != self.reader_slot]
+        return min(candidates, key=lambda i: self.sequences[i])
+
+    def _publish(self, slot, timestamp):
+        with self.condition:
+            self.sequence += 1
+            self.sequences[slot] = self.sequence
+            self.timestamps[slot] = timestamp
+            if self.latest_slot is not None and self.latest_slot != self.reader_slot:
+                # El frame anterior nunca fue leído
+                self.dropped_frames += 1
+                if self.stats is not None:
+                    self.stats.count("dropped")
+            self.latest_slot = slot
+            self.condition.notify_all()
+
+    def _run(self):
+        try:
+            self._capture_loop()
+        finally:
+            # El hilo libera la fuente: stop no puede hacerlo mientras siga dentro de read
+            self._release()
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def _capture_loop(self):
+        consecutive_failures = 0
+        while self.is_running:
+            with self.condition:
+                self.condition.wait_for(lambda: not self.paused or not self.is_running)
+                if not self.is_running:
+                    break
+                slot = self._next_write_slot()
+            buffer = self.buffers[slot]
+            read_start = time.perf_counter_ns()
+            ret, frame = self.cap.read(buffer)
+            timestamp = time.monotonic()
+            if self.stats is not None:
+                self.stats.record_ns("capture", time.perf_counter_ns() - read_start)
+            if not ret:
+                self.failed_reads += 1
+                consecutive_failures += 1
+                if not self.cap.isOpened():
+                    break
+                if consecutive_failures >= MAX_FAILED_READS:
+                    print(f"La fuente de video no entregó frames en {consecutive_failures} intentos seguidos")
+                    self.gave_up = True
+                    break
+                time.sleep(min(0.005 * 2 ** (consecutive_failures - 1), MAX_RETRY_DELAY))
+                continue
+            consecutive_failures = 0
+            if frame is not buffer:
+                # Cambió la resolución: el nuevo arreglo pasa a ser el buffer del slot
+                self.buffers[slot] = frame
+            if self.dump is not None:
+                self._dump(frame, timestamp)
+            self._publish(slot, timestamp)
+
+    def _dump(self, frame, timestamp):
+        try:
+            if self.dump.shape is not None and frame.shape != self.dump.shape:
+                # Un .vfs solo guarda frames de un tamaño: se sigue en otro segmento
+                previous = self.dump.path
+                self.dump = self.dump.next_segment()
+                print(f"Cambió la resolución a {frame.shape[1]}x{frame.shape[0]}: "
+                      f"{previous} cerrado, los frames siguen en {self.dump.path}")
+            self.dump.write(frame, timestamp)
+        except (OSError, ValueError) as error:
+            # Sin volcado la captura sigue igual; no se pierde la cámara por el disco
+            print(f"No se pudieron guardar los frames en {self.dump.path}: {error}")
+            dump, self.dump = self.dump, None
+            try:
+                dump.close()
+            except (OSError, ValueError):
+                pass
+
+    def _release(self):
+        with self.condition:
+            if self.released:
+                return
+            self.released = True
+        self.cap.release()
+        if self.dump is not None:
+            self.dump.close()
+
+    def read_latest(self):
+        """Devuelve (frame, secuencia, timestamp) del frame más reciente.
+
+        El frame es una vista del buffer interno y sigue siendo válido
+        hasta la siguiente llamada a read_latest.
+        """
+        with self.condition:
+            slot = self.latest_slot
+            if slot is None:
+                return None, 0, 0.0
+            self.reader_slot = slot
+            return self.buffers[slot], self.sequences[slot], self.timestamps[slot]
+
+    def wait_latest(self, last_sequence, timeout=None):
+        """Como read_latest, pero espera hasta que haya un frame más nuevo que last_sequence"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence > last_sequence or self.finished,
+                                    timeout)
+        return self.read_latest()
+
+    def pause(self):
+        """Deja de leer de la fuente; read_latest sigue devolviendo el último frame"""
+        with self.condition:
+            self.paused = True
+
+    def resume(self):
+        with self.condition:
+            self.paused = False
+            self.condition.notify_all()
+
+    def stop(self):
+        """Detiene el hilo de captura y libera la cámara.
+
+        Si el hilo sigue bloqueado en una lectura después de la espera, él
+        mismo libera la fuente (y cierra dump) al volver de ella.
+        """
+        with self.condition:
+            self.is_running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            if self.thread.is_alive():
+                return
+            self.thread = None
+        self._release()
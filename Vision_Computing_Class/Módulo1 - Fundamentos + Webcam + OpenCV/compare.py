@@ -0,0 +1,133 @@
+"""Vista de comparación: todos los modos de un grafo sobre el mismo frame.
+
+ComparisonGrid pide al grafo las salidas de todos los modos en una sola
+llamada a run: como cada nodo se ejecuta una sola vez por llamada, el
+trabajo compartido (la conversión a gris, el blur que usan blur y
+binary_blur) se calcula una vez para todas las celdas. Después compone
+los resultados en una imagen BGR, una celda por modo con su nombre, lista
+para prepare_display. Conviene componer directamente al tamaño de
+visualización: cada celda se reduce una sola vez y prepare_display solo
+tiene que convertir a RGB.
+
+Por defecto (downscale=True) el frame se reduce una sola vez al tamaño de
+una celda y todos los modos se calculan sobre esa versión: con 4 celdas se
+procesa la cuarta parte de los píxeles y la grilla cuesta menos de la
+mitad que mostrar los modos por separado. El resultado es el que se
+vería en modo adaptativo a esa escala; los kernels y umbrales actúan sobre
+una imagen más chica. Con downscale=False cada modo se calcula a
+resolución completa, útil para ajustes finos, pero los modos comparten
+poco (los de bordes solo la conversión a gris) y la grilla cuesta casi lo
+mismo que la suma de los modos.
+
+Ejemplo (compara el costo de update_frame, proceso más preparación para
+mostrar, contra el de mostrar cada modo por separado):
+    python compare.py --resolution 1920x1080
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmark import display_size
+from buffers import BufferPool, pool_buffer
+from display import paste_tile, prepare_display, resize_to
+from graph import EDGE_GRAPH, FILTER_GRAPH
+from multicam import grid_shape
+from sources import SyntheticSource
+
+
+class ComparisonGrid:
+    """Compone en una grilla las salidas de todos los modos de un grafo"""
+    def __init__(self, graph, downscale=True):
+        self.graph = graph
+        self.downscale = downscale
+        self.modes = list(graph.modes)
+        self.outputs = tuple(dict.fromkeys(graph.output_for(mode) for mode in self.modes))
+        self.rows, self.columns = grid_shape(len(self.modes))
+
+    def run(self, frame, params, pool=None, runner=None):
+        """Salidas de todos los modos: {nodo: imagen}. runner puede ser un TiledExecutor"""
+        return (runner or self.graph).run(frame, params, self.outputs, pool)
+
+    def layout(self, width, height):
+        """(ancho de celda, alto de celda, margen superior) para un mosaico de width x height"""
+        # Celdas con la proporción del mosaico, centradas en vertical
+        tile_width = width // self.columns // 2 * 2
+        tile_height = int(tile_width * height / width) // 2 * 2
+        return tile_width, tile_height, (height - tile_height * self.rows) // 2
+
+    def compose(self, frame, results, pool, size=None):
+        """Mosaico BGR de size = (ancho, alto), por defecto el del frame, con una celda por modo"""
+        width, height = size or (frame.shape[1], frame.shape[0])
+        tile_width, tile_height, top = self.layout(width, height)
+        canvas = pool_buffer(pool, "comparison", (height, width, 3))
+        if canvas is None:
+            canvas = np.empty((height, width, 3), np.uint8)
+        canvas[:top] = 0
+        canvas[top + tile_height * self.rows:] = 0
+        canvas[:, tile_width * self.columns:] = 0
+        for index in range(self.rows * self.columns):
+            row, column = divmod(index, self.columns)
+            x, y = column * tile_width, top + row * tile_height
+            if index >= len(self.modes):
+                canvas[y:y + tile_height, x:x + tile_width] = 0
+                continue
+            mode = self.graph.modes[self.modes[index]]
+            image = frame if mode["output"] == self.graph.input_name else results[mode["output"]]
+            paste_tile(canvas, x, y, tile_width, tile_height, image, pool,
+                       f"comparison_{index}", mode.get("label", mode["name"]))
+        return canvas
+
+    def process(self, frame, params, pool=None, runner=None, size=None):
+        """Calcula todos los modos y devuelve el mosaico"""
+        if self.downscale:
+            # Una sola reducción, compartida por todos los modos (nunca se agranda el frame)
+            tile_width, tile_height, _ = self.layout(*(size or (frame.shape[1], frame.shape[0])))
+            if tile_width < frame.shape[1]:
+                frame = resize_to(frame, tile_width, tile_height, pool, "comparison_input")
+        return self.compose(frame, self.run(frame, params, pool, runner), pool, size)
+
+
+def measure(graph, frame, params, display, count):
+    """Milisegundos medios (proceso y prepare_display) de cada modo por separado, de la grilla
+    reducida (la de por defecto) y de la grilla a resolución completa"""
+    pool = BufferPool()
+    separate = {}
+    for mode in graph.modes:
+        mode_params = dict(params, mode=mode)
+        prepare_display(graph.process(frame, mode_params, pool), display[0], display[1], pool)  # Calentamiento
+        start = time.perf_counter()
+        for _ in range(count):
+            prepare_display(graph.process(frame, mode_params, pool), display[0], display[1], pool)
+        separate[mode] = (time.perf_counter() - start) * 1000 / count
+    grids = {}
+    for downscale in (True, False):
+        grid = ComparisonGrid(graph, downscale)
+        prepare_display(grid.process(frame, params, pool, size=display), display[0], display[1], pool)
+        start = time.perf_counter()
+        for _ in range(count):
+            prepare_display(grid.process(frame, params, pool, size=display), display[0], display[1], pool)
+        grids[downscale] = (time.perf_counter() - start) * 1000 / count
+    return separate, grids[True], grids[False]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de la vista de comparación frente a cada modo por separado")
+    parser.add_argument("--resolution", default="1280x720", help="Tamaño del frame sintético (ANCHOxALTO)")
+    parser.add_argument("--frames", type=int, default=30, help="Repeticiones medidas")
+    parser.add_argument("--display-width", type=int, default=1280, help="Ancho máximo de visualización")
+    args = parser.parse_args()
+    width, height = (int(value) for value in args.resolution.lower().split("x"))
+    frame = SyntheticSource(width, height, realtime=False).read()[1]
+    display = display_size(width, height, args.display_width)
+
+    for graph in (EDGE_GRAPH, FILTER_GRAPH):
+        separate, grid, full = measure(graph, frame, graph.defaults(), display, args.frames)
+        total = sum(separate.values())
+        detail = ", ".join(f"{mode} {ms:.2f}" for mode, ms in separate.items())
+        print(f"{graph.name}: por separado {total:.2f} ms ({detail}) | grilla {grid:.2f} ms "
+              f"({grid / total:.0%} de la suma) | a resolución completa {full:.2f} ms ({full / total:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Salida de video hacia un widget de Tk.
+
+Crear un ImageTk.PhotoImage nuevo en cada frame es de lo más caro del
+ciclo y deja imágenes de Tk pendientes de liberar. DisplaySink mantiene un
+único PhotoImage por tamaño de visualización y lo actualiza con paste.
+
+prepare_display deja el resultado procesado listo para DisplaySink:
+primero reduce al tamaño de visualización sobre la representación más
+pequeña (un solo canal si el resultado es gris) y al final convierte a RGB.
+
+Con un objeto Instrumentation se registran las etapas resize, color, photo
+y paint (ver instrumentation.py).
+
+paste_tile copia una imagen a una celda de un mosaico BGR (multicam.py,
+compare.py).
+"""
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from buffers import pool_buffer
+from instrumentation import draw_overlay
+
+
+def interpolation_for(scale):
+    """Interpolación adecuada para el factor de escala"""
+    if scale < 0.5:
+        # Reducción fuerte: promedia los píxeles de origen y evita aliasing
+        return cv2.INTER_AREA
+    return cv2.INTER_LINEAR
+
+
+def resize_to(image, width, height, pool, name):
+    """Redimensiona image a width x height usando buffers del pool.
+
+    INTER_AREA con factores que no son exactamente 1/2 es varias veces más
+    lento que INTER_LINEAR, así que las reducciones fuertes se hacen primero
+    por mitades exactas (INTER_AREA rápido) y al final una interpolación lineal.
+    """
+    channels = image.shape[2:]
+    halvings = 0
+    while image.shape[1] >= 2 * width and image.shape[0] >= 2 * height:
+        # Recortar a dimensiones pares para que el factor sea exactamente 1/2
+        even = image[:image.shape[0] // 2 * 2, :image.shape[1] // 2 * 2]
+        half_size = (even.shape[1] // 2, even.shape[0] // 2)
+        image = cv2.resize(even, half_size, interpolation=cv2.INTER_AREA,
+                           dst=pool_buffer(pool, f"{name}_half{halvings}", (half_size[1], half_size[0]) + channels))
+        halvings += 1
+    source_height, source_width = image.shape[:2]
+    if (source_width, source_height) == (width, height):
+        return image
+    scale = min(width / source_width, height / source_height)
+    return cv2.resize(image, (width, height), dst=pool_buffer(pool, name, (height, width) + channels),
+                      interpolation=interpolation_for(scale))
+
+
+def paste_tile(canvas, x, y, width, height, image, pool, name, label=None):
+    """Copia image, redimensionada a width x height, a canvas (BGR) en (x, y), con un rótulo opcional"""
+    cell = canvas[y:y + height, x:x + width]
+    tile = resize_to(image, width, height, pool, name)
+    if tile.ndim == 2:
+        cv2.cvtColor(tile, cv2.COLOR_GRAY2BGR, dst=cell)
+    else:
+        np.copyto(cell, tile)
+    if label:
+        draw_overlay(cell, [label], origin=(8, 18), scale=0.45)
+    return cell
+
+
+def prepare_display(processed, width, height, pool, stats=None):
+    """Redimensiona y convierte a RGB en buffers del pool. Devuelve el arreglo RGB"""
+    start = time.perf_counter_ns()
+    # Redimensionar antes de convertir: con resultados grises se escala un solo canal
+    resized = resize_to(processed, width, height, pool, "display_resized")
+    resized_at = time.perf_counter_ns()
+
+    code = cv2.COLOR_GRAY2RGB if resized.ndim == 2 else cv2.COLOR_BGR2RGB
+    rgb = cv2.cvtColor(resized, code, dst=pool.get("display_rgb", (height, width, 3)))
+    if stats is not None:
+        stats.record_ns("resize", resized_at - start, resized_at)
+        stats.record_ns("color", time.perf_counter_ns() - resized_at)
+    return rgb
+
+
+class DisplaySink:
+    """Muestra frames RGB en un Label reutilizando la misma imagen de Tk"""
+    def __init__(self, label, stats=None):
+        self.label = label
+        self.stats = stats
+        self.size = None
+        self.image = None  # Imagen PIL intermedia, del mismo tamaño que la de Tk
+        self.photo = None
+        self.rebuilds = 0
+        self.last_cost = 0.0  # Segundos que tardó el último show
+
+    def show(self, rgb):
+        """Copia el arreglo RGB (uint8, contiguo) a la imagen mostrada"""
+        start = time.perf_counter()
+        height, width = rgb.shape[:2]
+        if self.size != (width, height):
+            # Cambió el tamaño de visualización: recrear la imagen de Tk
+            self.size = (width, height)
+            self.image = Image.new("RGB", self.size)
+            self.photo = ImageTk.PhotoImage(image=self.image)
+            self.label.configure(image=self.photo)
+            self.label.image = self.photo  # Mantener referencia
+            self.rebuilds += 1
+        self.image.frombytes(rgb)
+        self.photo.paste(self.image)
+        self.last_cost = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.record("photo", self.last_cost)
+            # Tk redibuja en sus tareas idle; esta se ejecuta después de las ya pendientes
+            painted = time.perf_counter_ns()
+            self.label.after_idle(self._painted, painted)
+
+    def _painted(self, start):
+        self.stats.record_ns("paint", time.perf_counter_ns() - start)
@@ -0,0 +1,246 @@
+"""Almacén de frames crudos para repeticiones deterministas.
+
+Para comparar el rendimiento de los filtros entre versiones hace falta la
+misma entrada bit a bit, y decodificar un video comprimido agrega ruido y
+CPU a la medición. Un archivo .vfs guarda los frames sin comprimir:
+
+    cabecera    HEADER_SIZE bytes: MAGIC, versión, canales, ancho, alto,
+                cantidad de frames, posición del índice y FPS (HEADER_FORMAT)
+    frames      uint8 contiguos, todos de alto × ancho × canales bytes
+    índice      un float64 por frame: segundos desde el primero
+
+FrameStoreWriter escribe el archivo (la cabecera definitiva y el índice se
+escriben al cerrar; si el proceso termina antes, FrameStore recupera los
+frames completos a partir del tamaño del archivo). Como todos los frames de
+un archivo miden lo mismo, si la resolución cambia a mitad de captura se
+sigue en otro segmento: next_segment abre captura_001.vfs, captura_002.vfs...
+junto a captura.vfs. FrameStore lo abre con
+np.memmap: cada frame es una vista de solo lectura sobre el archivo, sin
+copias ni decodificación. FrameStoreSource lo expone como fuente (URI
+frames:archivo.vfs o simplemente archivo.vfs en sources.open_source); como
+las demás fuentes, read copia el frame a image o a un arreglo nuevo, que
+quien lo recibe puede modificar.
+
+Ejemplos:
+    python framestore.py record 0 captura.vfs --frames 600
+    python framestore.py record video.mp4 prueba.vfs
+    python framestore.py info captura.vfs
+"""
+import argparse
+import os
+import struct
+import time
+
+import numpy as np
+
+from sources import Pacer, open_source
+
+MAGIC = b"VCFRAMES"
+VERSION = 1
+HEADER_FORMAT = "<8sHHIIQQd"  # magic, versión, canales, ancho, alto, frames, índice, fps
+HEADER_SIZE = 4096  # Los frames empiezan alineados a página
+EXTENSION = ".vfs"
+
+
+def segment_path(path, segment):
+    """Archivo del segmento: path para el 0, nombre_001.vfs, nombre_002.vfs... para los siguientes"""
+    if segment == 0:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}_{segment:03d}{extension}"
+
+
+class FrameStoreWriter:
+    """Escribe frames uint8 de tamaño fijo en un archivo .vfs"""
+    def __init__(self, path, fps=0.0, segment=0):
+        self.base_path = path
+        self.segment = segment
+        self.path = segment_path(path, segment)
+        self.fps = fps  # 0 = calcularlo con los timestamps al cerrar
+        self.file = open(self.path, "wb")
+        self.file.write(bytes(HEADER_SIZE))
+        self.shape = None
+        self.timestamps = []
+        self.first_timestamp = None
+
+    @property
+    def count(self):
+        return len(self.timestamps)
+
+    def write(self, frame, timestamp=None):
+        """Agrega un frame (por defecto con el instante actual de time.monotonic)"""
+        if frame.dtype != np.uint8:
+            raise ValueError(f"Solo se guardan frames uint8, no {frame.dtype}")
+        if self.shape is None:
+            if frame.ndim not in (2, 3):
+                raise ValueError(f"Forma de frame no soportada: {frame.shape}")
+            self.shape = frame.shape
+            # Cabecera provisoria (sin índice) por si el proceso termina sin llamar a close
+            self._write_header(0, 0, self.fps)
+        elif frame.shape != self.shape:
+            raise ValueError(f"Todos los frames deben medir {self.shape}, no {frame.shape}")
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.file.write(np.ascontiguousarray(frame).data)
+        self.timestamps.append(timestamp - self.first_timestamp)
+
+    def next_segment(self):
+        """Cierra este archivo y devuelve el escritor del segmento siguiente (mismo FPS)"""
+        self.close()
+        return FrameStoreWriter(self.base_path, self.fps, self.segment + 1)
+
+    def close(self):
+        """Escribe el índice y la cabecera definitiva"""
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.asarray(self.timestamps, dtype="<f8").tobytes())
+        fps = self.fps
+        if fps <= 0:
+            duration = self.timestamps[-1] if self.timestamps else 0.0
+            fps = (len(self.timestamps) - 1) / duration if duration > 0 else 30.0
+        if self.shape is not None:
+            self._write_header(len(self.timestamps), index_offset, fps)
+        self.file.close()
+        self.file = None
+
+    def _write_header(self, count, index_offset, fps):
+        height, width = self.shape[:2]
+        channels = self.shape[2] if len(self.shape) == 3 else 1
+        position = self.file.tell()
+        self.file.seek(0)
+        self.file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, channels, width, height,
+                                    count, index_offset, fps))
+        self.file.seek(position)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class FrameStore:
+    """Archivo .vfs abierto con np.memmap: frames[i] es una vista sin copia"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(struct.calcsize(HEADER_FORMAT))
+        if len(header) < struct.calcsize(HEADER_FORMAT):
+            raise ValueError(f"{path} no es un almacén de frames")
+        magic, version, channels, width, height, count, index_offset, fps = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un almacén de frames")
+        if version != VERSION:
+            raise ValueError(f"Versión de almacén no soportada: {version}")
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.fps = fps or 30.0
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        self.frame_bytes = width * height * channels
+        self.complete = index_offset > 0
+        if not self.complete:
+            # No se llamó a close: se recuperan los frames completos y se asume un ritmo constante
+            count = (os.path.getsize(path) - HEADER_SIZE) // self.frame_bytes
+        self.frames = np.memmap(path, np.uint8, "r", offset=HEADER_SIZE, shape=(count,) + shape)
+        if self.complete:
+            self.timestamps = np.memmap(path, "<f8", "r", offset=index_offset, shape=(count,))
+        else:
+            self.timestamps = np.arange(count) / self.fps
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    @property
+    def nbytes(self):
+        return self.frame_bytes * len(self.frames)
+
+
+class FrameStoreSource:
+    """Fuente que reproduce un archivo .vfs (misma interfaz que las de sources.py).
+
+    read copia el frame en image si tiene la misma forma (así la captura
+    en procesos escribe directo en su slot) o, si no, en un arreglo nuevo:
+    la vista del archivo es de solo lectura y los consumidores dibujan
+    sobre el frame (cv2.putText) o lo reutilizan como buffer.
+    """
+    def __init__(self, path, realtime=True, loop=False, fps=None):
+        self.store = FrameStore(path)
+        self.loop = loop
+        self.width = self.store.width
+        self.height = self.store.height
+        self.fps = fps or self.store.fps
+        self.pacer = Pacer(self.fps, realtime)
+        self.index = 0
+        self.opened = len(self.store) > 0
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        if self.index >= len(self.store):
+            if not self.loop:
+                self.opened = False
+                return False, None
+            self.index = 0
+        self.pacer.wait()
+        frame = self.store[self.index]
+        self.index += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, np.array(frame)
+
+    def release(self):
+        self.opened = False
+
+
+def record(uri, path, frames=0):
+    """Copia los frames de una fuente a un archivo .vfs. Devuelve la cantidad escrita"""
+    source = open_source(uri)
+    if not source.isOpened():
+        raise ValueError(f"No se pudo abrir la fuente: {uri}")
+    try:
+        with FrameStoreWriter(path) as writer:
+            while not frames or writer.count < frames:
+                ret, frame = source.read()
+                if not ret:
+                    break
+                writer.write(frame)
+    finally:
+        source.release()
+    return writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén de frames crudos (.vfs)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Grabar una fuente en un archivo .vfs")
+    record_parser.add_argument("source", help="URI de la fuente (ver sources.py)")
+    record_parser.add_argument("output", help="Archivo .vfs de salida")
+    record_parser.add_argument("--frames", type=int, default=0, help="Grabar como máximo N frames")
+    info_parser = commands.add_parser("info", help="Mostrar la cabecera de un archivo .vfs")
+    info_parser.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        count = record(args.source, args.output, args.frames)
+        print(f"{count} frames guardados en {args.output} ({os.path.getsize(args.output) / 2**20:.1f} MB)")
+        return
+    store = FrameStore(args.path)
+    duration = float(store.timestamps[-1]) if len(store) else 0.0
+    print(f"{args.path}: {len(store)} frames de {store.width}x{store.height}x{store.channels} "
+          f"| {store.fps:.2f} FPS | {duration:.2f} s | {store.nbytes / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Frame congelado con recálculo incremental.
+
+Al congelar, las aplicaciones guardan una copia del último frame y dejan de
+leer la fuente. FrozenFrame conserva el resultado de cada nodo del grafo
+junto con los parámetros con que se calculó y la versión de sus entradas:
+al mover un control solo se recalculan los nodos cuyos parámetros cambiaron
+y los que dependen de ellos. Por ejemplo, cambiar el umbral en binary_blur
+reutiliza la conversión a gris y el blur y solo vuelve a aplicar la tabla.
+"""
+from buffers import BufferPool
+
+
+class FrozenFrame:
+    """Un frame fijo y los resultados de sus nodos, que se recalculan solo si hace falta"""
+    def __init__(self, graph, frame):
+        self.graph = graph
+        self.frame = frame.copy()
+        # Pool propio: el procesamiento en vivo no puede sobrescribir estos resultados
+        self.pool = BufferPool()
+        self.results = {graph.input_name: self.frame}
+        self.versions = {graph.input_name: 0}  # Aumenta cada vez que se recalcula un nodo
+        self.signatures = {}  # nodo -> (parámetros de la cadena, versiones de las entradas)
+        self.recomputed = []  # Nodos recalculados en la última llamada
+
+    def run(self, params, outputs):
+        """Como graph.run sobre el frame congelado. Devuelve {nombre: imagen}"""
+        self.recomputed = []
+        for node, chain in self.graph.fused_plan(outputs):
+            links = chain or [node]
+            signature = (tuple(tuple(sorted(link.resolve(params).items())) for link in links),
+                         tuple(self.versions[name] for name in links[0].inputs))
+            if self.signatures.get(node.name) == signature:
+                continue
+            self.graph.run_step(node, chain, self.results, params, self.pool)
+            self.signatures[node.name] = signature
+            self.versions[node.name] = self.versions.get(node.name, 0) + 1
+            self.recomputed.append(node.name)
+            for link in links[:-1]:
+                # Si la cadena no se pudo fusionar, sus intermedios se sobrescribieron
+                self.signatures.pop(link.name, None)
+        return {name: self.results[name] for name in outputs}
+
+    def process(self, params):
+        """Resultado del modo params["mode"]"""
+        output = self.graph.output_for(params["mode"])
+        return self.run(params, (output,))[output]
@@ -0,0 +1,76 @@
+"""Resolución de trabajo adaptativa.
+
+Canny, Sobel y el blur Gaussiano cuestan proporcionalmente a la cantidad de
+píxeles. ResolutionGovernor mide cuánto tarda el procesamiento y ajusta la
+escala a la que se procesa cada frame para alcanzar un FPS objetivo: la
+baja cuando el procesamiento no entra en el presupuesto del frame y la sube
+cuando sobra tiempo.
+"""
+import math
+
+from display import resize_to
+
+
+def working_size(width, height, scale):
+    """Tamaño de trabajo para un frame de width x height a la escala dada (dimensiones pares)"""
+    return (max(2, int(width * scale) // 2 * 2),
+            max(2, int(height * scale) // 2 * 2))
+
+
+def resize_to_scale(frame, scale, pool):
+    """Reduce el frame a la escala de trabajo (o lo devuelve tal cual)"""
+    height, width = frame.shape[:2]
+    working_width, working_height = working_size(width, height, scale)
+    return resize_to(frame, working_width, working_height, pool, "working")
+
+
+class ResolutionGovernor:
+    """Elige la escala de procesamiento para alcanzar target_fps"""
+    def __init__(self, target_fps, min_scale=0.25, max_scale=1.0, step=0.05, smoothing=0.2):
+        self.frame_budget = 1.0 / target_fps
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step  # La escala se redondea a múltiplos de step para no cambiar buffers a cada frame
+        self.smoothing = smoothing
+        self.scale = max_scale
+        self.process_average = None
+        self.other_average = 0.0
+
+    def working_size(self, width, height):
+        """Tamaño de trabajo para un frame de width x height (dimensiones pares)"""
+        return working_size(width, height, self.scale)
+
+    def resize(self, frame, pool):
+        """Reduce el frame a la resolución de trabajo actual (o lo devuelve tal cual)"""
+        return resize_to_scale(frame, self.scale, pool)
+
+    def update(self, process_seconds, other_seconds=0.0):
+        """Registra la latencia del último frame y devuelve la nueva escala.
+
+        process_seconds es el tiempo que depende de la resolución de trabajo;
+        other_seconds el resto del frame (mostrar, Tk), que no cambia con ella.
+        """
+        if self.process_average is None:
+            self.process_average = process_seconds
+            self.other_average = other_seconds
+        else:
+            self.process_average += self.smoothing * (process_seconds - self.process_average)
+            self.other_average += self.smoothing * (other_seconds - self.other_average)
+
+        # Tiempo disponible para procesar; siempre se deja al menos un cuarto del frame
+        budget = max(self.frame_budget - self.other_average, self.frame_budget * 0.25)
+        if self.process_average > budget * 1.05:
+            # El costo escala con el área: ajustar por la raíz de la proporción
+            target = self.scale * math.sqrt(budget / self.process_average)
+            new_scale = math.floor(target / self.step) * self.step
+        elif self.process_average < budget * 0.7:
+            new_scale = self.scale + self.step
+        else:
+            return self.scale
+
+        new_scale = min(self.max_scale, max(self.min_scale, round(new_scale, 4)))
+        if new_scale != self.scale:
+            # Reescalar el promedio para no reaccionar dos veces al mismo exceso
+            self.process_average *= (new_scale / self.scale) ** 2
+            self.scale = new_scale
+        return self.scale
@@ -0,0 +1,358 @@
+"""Grafo de filtros declarativo.
+
+Un grafo describe, normalmente en un archivo JSON de la carpeta graphs/:
+    params  parámetros tipados con su rango, valor por defecto y textos de la UI
+    nodes   etapas (gray, blur, threshold, canny, sobel, resize) con sus entradas
+    modes   qué nodo se muestra en cada modo de visualización
+
+Los parámetros de un nodo pueden ser constantes o referencias "$nombre" a
+un parámetro del grafo. Al procesar solo se ejecutan los nodos de los que
+depende la salida pedida, y cada uno una sola vez por frame aunque lo usen
+varias salidas (por ejemplo, una única conversión a gris).
+
+Las operaciones puntuales (threshold, gamma, invert) encadenadas, cuyos
+resultados intermedios nadie más usa, se fusionan en una sola tabla de
+256 entradas (lut.py) y se aplican en una pasada.
+
+Si tracer es un TraceRecorder activo (tracing.py), run registra un evento
+por cada etapa ejecutada.
+"""
+import json
+import os
+
+from processing import (BLUR_ENGINES, SOBEL_ENGINES, THRESHOLD_TYPES, canny, gaussian_blur, odd_kernel,
+                        sobel_magnitude, threshold, to_gray)
+from display import resize_to
+from lut import apply_lut, chain_table, step
+
+GRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "graphs")
+
+
+class Param:
+    """Parámetro tipado: int, odd (entero impar), float o choice"""
+    TYPES = ("int", "odd", "float", "choice")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.type = spec.get("type", "int")
+        if self.type not in self.TYPES:
+            raise ValueError(f"Tipo de parámetro desconocido para {name}: {self.type}")
+        self.minimum = spec.get("min")
+        self.maximum = spec.get("max")
+        self.options = tuple(spec.get("options", ()))
+        if self.type == "choice" and not self.options:
+            raise ValueError(f"El parámetro {name} es choice pero no tiene options")
+        # Textos para la interfaz
+        self.group = spec.get("group", name)
+        self.label = spec.get("label", name + ":")
+        self.title = spec.get("title")  # Nombre corto para el título de la ventana
+        self.tooltip = spec.get("tooltip", "")
+        self.format = spec.get("format")
+        self.default = self.coerce(spec["default"]) if "default" in spec else None
+
+    def coerce(self, value):
+        """Convierte value al tipo del parámetro y lo limita a su rango"""
+        if self.type == "choice":
+            value = str(value)
+            if value not in self.options:
+                raise ValueError(f"Valor inválido para {self.name}: {value}")
+            return value
+        if self.type == "odd":
+            return odd_kernel(max(float(value), self.minimum or 1), self.maximum or 31)
+        value = int(float(value)) if self.type == "int" else float(value)
+        if self.minimum is not None and value < self.minimum:
+            value = type(value)(self.minimum)
+        if self.maximum is not None and value > self.maximum:
+            value = type(value)(self.maximum)
+        return value
+
+    def display(self, value):
+        """Texto del valor para mostrar en la interfaz"""
+        return self.format.format(value) if self.format else str(value)
+
+
+class Op:
+    """Operación registrada: función y tipos de sus parámetros.
+
+    point indica una operación puntual con tabla en lut.TABLE_BUILDERS;
+    gray_input, que la operación se aplica sobre la imagen en escala de grises.
+    """
+    def __init__(self, name, function, params, arity, point=False, gray_input=False):
+        self.name = name
+        self.function = function
+        self.params = {key: Param(key, spec) for key, spec in params.items()}
+        self.arity = arity
+        self.point = point
+        self.gray_input = gray_input
+
+
+OPS = {}
+
+
+def register_op(name, params=None, arity=1, point=False, gray_input=False):
+    """Registra una función fn(inputs, args, pool, name) como operación del grafo"""
+    def decorator(function):
+        OPS[name] = Op(name, function, params or {}, arity, point, gray_input)
+        return function
+    return decorator
+
+
+@register_op("gray")
+def op_gray(inputs, args, pool, name):
+    return to_gray(inputs[0], pool, name)
+
+
+@register_op("canny", {"threshold1": {"type": "int", "min": 0, "max": 255, "default": 50},
+                       "threshold2": {"type": "int", "min": 0, "max": 255, "default": 150}})
+def op_canny(inputs, args, pool, name):
+    return canny(to_gray(inputs[0], pool, name + "_gray"), args["threshold1"], args["threshold2"], pool, name)
+
+
+@register_op("sobel", {"ksize": {"type": "odd", "min": 1, "max": 7, "default": 3},
+                       "scale": {"type": "float", "default": 1.0},
+                       "delta": {"type": "float", "default": 0},
+                       "engine": {"type": "choice", "options": SOBEL_ENGINES, "default": "float32"}})
+def op_sobel(inputs, args, pool, name):
+    return sobel_magnitude(to_gray(inputs[0], pool, name + "_gray"), args["ksize"], args["scale"],
+                           args["delta"], args["engine"], pool, name)
+
+
+@register_op("blur", {"ksize": {"type": "odd", "min": 1, "max": 31, "default": 5},
+                      "sigma": {"type": "float", "min": 0.0, "default": 0.0},
+                      "engine": {"type": "choice", "options": BLUR_ENGINES, "default": "auto"}})
+def op_blur(inputs, args, pool, name):
+    return gaussian_blur(inputs[0], args["ksize"], args["sigma"], args["engine"], pool, name)
+
+
+@register_op("threshold", {"value": {"type": "int", "min": 0, "max": 255, "default": 127},
+                           "type": {"type": "choice", "options": tuple(THRESHOLD_TYPES), "default": "BINARY"}},
+             point=True, gray_input=True)
+def op_threshold(inputs, args, pool, name):
+    return threshold(to_gray(inputs[0], pool, name + "_gray"), args["value"], args["type"], pool, name)
+
+
+@register_op("gamma", {"gamma": {"type": "float", "min": 0.1, "max": 5.0, "default": 1.0}}, point=True)
+def op_gamma(inputs, args, pool, name):
+    return apply_lut(inputs[0], chain_table((step("gamma", args),)), pool, name)
+
+
+@register_op("invert", point=True)
+def op_invert(inputs, args, pool, name):
+    return apply_lut(inputs[0], chain_table((step("invert", args),)), pool, name)
+
+
+@register_op("resize", {"scale": {"type": "float", "min": 0.05, "max": 4.0, "default": 0.5}})
+def op_resize(inputs, args, pool, name):
+    image = inputs[0]
+    height, width = image.shape[:2]
+    return resize_to(image, max(1, round(width * args["scale"])), max(1, round(height * args["scale"])),
+                     pool, name)
+
+
+class Node:
+    """Etapa del grafo: una operación aplicada a las salidas de otros nodos"""
+    def __init__(self, spec, graph_params):
+        self.name = spec["name"]
+        if spec["op"] not in OPS:
+            raise ValueError(f"Operación desconocida en el nodo {self.name}: {spec['op']}")
+        self.op = OPS[spec["op"]]
+        self.inputs = list(spec.get("inputs", []))
+        if len(self.inputs) != self.op.arity:
+            raise ValueError(f"El nodo {self.name} necesita {self.op.arity} entrada(s)")
+
+        # Cada parámetro de la operación es una constante o una referencia "$param"
+        self.constants = {}
+        self.references = {}
+        bindings = spec.get("params", {})
+        for key, op_param in self.op.params.items():
+            value = bindings.get(key, op_param.default)
+            if isinstance(value, str) and value.startswith("$"):
+                if value[1:] not in graph_params:
+                    raise ValueError(f"El nodo {self.name} usa el parámetro inexistente {value}")
+                self.references[key] = value[1:]
+            else:
+                self.constants[key] = op_param.coerce(value)
+        unknown = set(bindings) - set(self.op.params)
+        if unknown:
+            raise ValueError(f"Parámetros desconocidos en el nodo {self.name}: {', '.join(sorted(unknown))}")
+
+    def resolve(self, params):
+        """Valores de los parámetros de la operación para este frame"""
+        args = dict(self.constants)
+        for key, param_name in self.references.items():
+            args[key] = self.op.params[key].coerce(params[param_name])
+        return args
+
+
+class FilterGraph:
+    """Grafo acíclico de etapas con salidas por modo"""
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec.get("name", "graph")
+        self.input_name = spec.get("input", "frame")
+        self.params = [Param(p["name"], p) for p in spec.get("params", [])]
+        self.param_map = {param.name: param for param in self.params}
+
+        self.nodes = {}
+        for node_spec in spec["nodes"]:
+            node = Node(node_spec, self.param_map)
+            if node.name in self.nodes or node.name == self.input_name:
+                raise ValueError(f"Nombre de nodo repetido: {node.name}")
+            self.nodes[node.name] = node
+
+        self.modes = {}
+        for mode in spec["modes"]:
+            if mode["output"] != self.input_name and mode["output"] not in self.nodes:
+                raise ValueError(f"El modo {mode['name']} usa el nodo inexistente {mode['output']}")
+            self.modes[mode["name"]] = mode
+        self.default_mode = spec.get("default_mode", next(iter(self.modes)))
+        self.plans = {}
+        self.tracer = None
+        # Validar entradas y ciclos una sola vez
+        self.plan(tuple(self.nodes))
+
+    def plan(self, outputs):
+        """Nodos necesarios para calcular outputs, en orden topológico"""
+        outputs = tuple(outputs)
+        if outputs in self.plans:
+            return self.plans[outputs]
+        order = []
+        state = {}  # 1 = visitando, 2 = listo
+
+        def visit(name):
+            if name == self.input_name or state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"El grafo tiene un ciclo en el nodo {name}")
+            if name not in self.nodes:
+                raise ValueError(f"Nodo inexistente: {name}")
+            state[name] = 1
+            for input_name in self.nodes[name].inputs:
+                visit(input_name)
+            state[name] = 2
+            order.append(self.nodes[name])
+
+        for name in outputs:
+            visit(name)
+        self.plans[outputs] = order
+        return order
+
+    def fused_plan(self, outputs):
+        """Plan con las cadenas de operaciones puntuales agrupadas: [(nodo, cadena)]
+
+        cadena es la lista de nodos puntuales que terminan en nodo y se pueden
+        aplicar con una sola tabla (vacía si el nodo se ejecuta solo).
+        """
+        outputs = tuple(outputs)
+        key = ("fused",) + outputs
+        if key in self.plans:
+            return self.plans[key]
+        order = self.plan(outputs)
+        consumers = {}
+        for node in order:
+            for name in node.inputs:
+                consumers[name] = consumers.get(name, 0) + 1
+        chains = {}
+        for node in order:
+            chain = [node] if node.op.point else []
+            source = node.inputs[0] if node.inputs else None
+            if (chain and source in chains and chains[source] and consumers.get(source) == 1
+                    and source not in outputs):
+                # El nodo anterior es puntual y solo lo usa este: se absorbe en la cadena
+                chain = chains.pop(source) + chain
+            chains[node.name] = chain
+        fused = [(node, chains[node.name] if len(chains[node.name]) > 1 else [])
+                 for node in order if node.name in chains]
+        self.plans[key] = fused
+        return fused
+
+    def defaults(self):
+        """Valores por defecto de todos los parámetros, más el modo por defecto"""
+        params = {param.name: param.default for param in self.params}
+        params["mode"] = self.default_mode
+        return params
+
+    def output_for(self, mode):
+        return self.modes[mode]["output"]
+
+    def run_step(self, node, chain, results, params, pool=None):
+        """Ejecuta un paso de fused_plan leyendo sus entradas de results y guardando ahí el resultado"""
+        if chain:
+            source = results[chain[0].inputs[0]]
+            # En color solo la primera operación puede pedir la imagen en gris
+            if source.ndim == 2 or not any(link.op.gray_input for link in chain[1:]):
+                if chain[0].op.gray_input:
+                    source = to_gray(source, pool, chain[0].name + "_gray")
+                table = chain_table(tuple(step(link.op.name, link.resolve(params)) for link in chain))
+                results[node.name] = apply_lut(source, table, pool, node.name)
+                return
+            # No se puede fusionar: ejecutar los nodos de la cadena uno por uno
+            for link in chain[:-1]:
+                results[link.name] = link.op.function([results[link.inputs[0]]], link.resolve(params),
+                                                      pool, link.name)
+        inputs = [results[name] for name in node.inputs]
+        results[node.name] = node.op.function(inputs, node.resolve(params), pool, node.name)
+
+    def run(self, frame, params, outputs, pool=None):
+        """Calcula los nodos pedidos. Devuelve {nombre: imagen}"""
+        results = {self.input_name: frame}
+        tracer = self.tracer
+        for node, chain in self.fused_plan(outputs):
+            if tracer is None or not tracer.enabled:
+                self.run_step(node, chain, results, params, pool)
+            else:
+                with tracer.span(node.name):
+                    self.run_step(node, chain, results, params, pool)
+        return {name: results[name] for name in outputs}
+
+    def process(self, frame, params, pool=None):
+        """Resultado del modo params["mode"]"""
+        output = self.output_for(params["mode"])
+        return self.run(frame, params, (output,), pool)[output]
+
+    def mode_params(self, mode):
+        """Parámetros del grafo que afectan al modo, en el orden en que se declararon"""
+        used = set()
+        for node in self.plan((self.output_for(mode),)):
+            used.update(node.references.values())
+        return [param for param in self.params if param.name in used]
+
+    def param_groups(self):
+        """Parámetros agrupados para la interfaz: {grupo: [Param]}"""
+        groups = {}
+        for param in self.params:
+            groups.setdefault(param.group, []).append(param)
+        return groups
+
+    def mode_groups(self, mode):
+        return {param.group for param in self.mode_params(mode)}
+
+
+def load_graph(path):
+    """Lee un grafo desde un archivo JSON"""
+    with open(path, encoding="utf-8") as f:
+        return FilterGraph(json.load(f))
+
+
+EDGE_GRAPH = load_graph(os.path.join(GRAPH_DIR, "edges.json"))
+FILTER_GRAPH = load_graph(os.path.join(GRAPH_DIR, "filters.json"))
+
+
+def graph_for_mode(mode):
+    """Grafo incorporado que define el modo"""
+    for graph in (EDGE_GRAPH, FILTER_GRAPH):
+        if mode in graph.modes:
+            return graph
+    raise ValueError(f"Modo desconocido: {mode}")
+
+
+def default_params():
+    """Valores por defecto de los parámetros de ambos grafos incorporados"""
+    params = FILTER_GRAPH.defaults()
+    params.update(EDGE_GRAPH.defaults())
+    return params
+
+
+def process(frame, params, pool=None):
+    """Procesa el frame con el grafo incorporado que define params["mode"]"""
+    return graph_for_mode(params["mode"]).process(frame, params, pool)
@@ -0,0 +1,207 @@
+"""Procesamiento por lotes sin interfaz gráfica.
+
+Aplica los filtros de la aplicación en tiempo real (app.py) a un video,
+una carpeta de imágenes o una fuente sintética tan rápido como lo permita
+la CPU, y reporta los frames por segundo obtenidos.
+
+Ejemplos:
+    python headless.py video.mp4 --mode canny --output bordes.mp4
+    python headless.py fotos/ --mode binary_blur --threshold 100 --output salida/
+    python headless.py synthetic:1920x1080@0?frames=300 --mode sobel
+    python headless.py video.mp4 --mode blur --blur-kernel 31 --workers 4 --output suave.mp4
+    python headless.py captura.vfs --mode canny   (frames crudos de framestore.py, sin decodificar)
+"""
+import argparse
+import os
+import time
+
+import cv2
+
+from buffers import BufferPool
+from graph import default_params, graph_for_mode, process
+from processing import BLUR_ENGINES, SOBEL_ENGINES, THRESHOLD_TYPES
+from recording import VIDEO_EXTENSIONS
+from sources import open_source
+from tiling import TiledExecutor
+from workers import BACKENDS, ProcessingPool
+
+HEADLESS_MODES = ("grayscale", "canny", "sobel", "binary", "blur", "binary_blur")
+DEFAULTS = default_params()
+
+
+def build_params(args):
+    """Arma el diccionario de parámetros a partir de los argumentos"""
+    params = dict(DEFAULTS)
+    params.update({
+        "mode": args.mode,
+        "canny_threshold1": args.threshold1,
+        "canny_threshold2": args.threshold2,
+        "sobel_kernel": args.sobel_kernel,
+        "sobel_scale": args.sobel_scale,
+        "sobel_delta": args.sobel_delta,
+        "sobel_engine": args.sobel_engine,
+        "threshold_value": args.threshold,
+        "threshold_type": args.threshold_type,
+        "blur_kernel_size": args.blur_kernel,
+        "blur_sigma_x": args.blur_sigma,
+        "blur_engine": args.blur_engine,
+    })
+    return params
+
+
+class OutputWriter:
+    """Escribe los resultados como video o como imágenes numeradas en una carpeta"""
+    def __init__(self, path, fps):
+        self.path = path
+        self.fps = fps if fps > 0 else 30.0
+        self.writer = None
+        self.count = 0
+        extension = os.path.splitext(path)[1].lower()
+        self.fourcc = VIDEO_EXTENSIONS.get(extension)
+        if self.fourcc is None:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, frame):
+        if self.fourcc is None:
+            cv2.imwrite(os.path.join(self.path, f"frame_{self.count:06d}.png"), frame)
+        else:
+            if self.writer is None:
+                height, width = frame.shape[:2]
+                self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                              self.fps, (width, height), frame.ndim == 3)
+            self.writer.write(frame)
+        self.count += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+
+
+def run(source, params, writer=None, max_frames=0, tiler=None):
+    """Procesa todos los frames de la fuente. Devuelve (frames, segundos totales, segundos de proceso)
+
+    Con un TiledExecutor cada frame se procesa por franjas en paralelo.
+    """
+    frames = 0
+    process_time = 0.0
+    buffer = None
+    pool = BufferPool()
+    start = time.perf_counter()
+    while source.isOpened() and (max_frames <= 0 or frames < max_frames):
+        ret, frame = source.read(buffer)
+        if not ret:
+            break
+        buffer = frame
+
+        t0 = time.perf_counter()
+        if tiler is not None:
+            processed = tiler.process(frame, params, pool)
+        else:
+            processed = process(frame, params, pool)
+        process_time += time.perf_counter() - t0
+
+        if writer is not None:
+            writer.write(processed)
+        frames += 1
+    return frames, time.perf_counter() - start, process_time
+
+
+def run_parallel(source, params, workers, writer=None, max_frames=0):
+    """Como run, pero procesando en un ProcessingPool. Los frames se escriben en orden"""
+    frames = 0
+    process_time = 0.0
+    start = time.perf_counter()
+
+    def write(ready):
+        nonlocal process_time
+        for sequence, processed, _, seconds in ready:
+            process_time += seconds
+            if writer is not None:
+                writer.write(processed)
+
+    while source.isOpened() and (max_frames <= 0 or frames < max_frames):
+        # Cada frame en su propio arreglo: el worker lo usa mientras se lee el siguiente
+        ret, frame = source.read()
+        if not ret:
+            break
+        workers.submit(frame, frames, params, block=True)
+        frames += 1
+        write(workers.collect())
+    write(workers.drain())
+    return frames, time.perf_counter() - start, process_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Procesamiento de video por lotes sin interfaz gráfica")
+    parser.add_argument("input", help="Video, carpeta de imágenes o URI de fuente (synthetic:WxH@0)")
+    parser.add_argument("--mode", choices=HEADLESS_MODES, required=True)
+    parser.add_argument("--output", help="Archivo de video (.mp4, .avi, ...) o carpeta para imágenes")
+    parser.add_argument("--max-frames", type=int, default=0, help="Procesar como máximo N frames")
+    parser.add_argument("--workers", type=int, default=0, help="Procesar en N hilos o procesos (0 = en este hilo)")
+    parser.add_argument("--backend", choices=BACKENDS, default="thread", help="Tipo de worker para --workers")
+    parser.add_argument("--depth", type=int, default=0, help="Frames en vuelo como máximo (por defecto 2 × workers)")
+    parser.add_argument("--tiles", type=int, default=0,
+                        help="Dividir cada frame en N franjas procesadas en paralelo (menor latencia)")
+    # Canny
+    parser.add_argument("--threshold1", type=int, default=DEFAULTS["canny_threshold1"])
+    parser.add_argument("--threshold2", type=int, default=DEFAULTS["canny_threshold2"])
+    # Sobel
+    parser.add_argument("--sobel-kernel", type=int, default=DEFAULTS["sobel_kernel"])
+    parser.add_argument("--sobel-scale", type=float, default=DEFAULTS["sobel_scale"])
+    parser.add_argument("--sobel-delta", type=int, default=DEFAULTS["sobel_delta"])
+    parser.add_argument("--sobel-engine", choices=SOBEL_ENGINES, default=DEFAULTS["sobel_engine"])
+    # Binarización
+    parser.add_argument("--threshold", type=int, default=DEFAULTS["threshold_value"])
+    parser.add_argument("--threshold-type", choices=list(THRESHOLD_TYPES),
+                        default=DEFAULTS["threshold_type"])
+    # Blur
+    parser.add_argument("--blur-kernel", type=int, default=DEFAULTS["blur_kernel_size"])
+    parser.add_argument("--blur-sigma", type=float, default=DEFAULTS["blur_sigma_x"])
+    parser.add_argument("--blur-engine", choices=BLUR_ENGINES, default=DEFAULTS["blur_engine"])
+    args = parser.parse_args()
+    if args.workers > 0 and args.tiles > 1:
+        # Cada worker procesa un frame entero: las franjas no se aplicarían
+        parser.error("--workers y --tiles no se pueden combinar")
+
+    source = open_source(args.input, realtime=False)
+    if not source.isOpened():
+        print(f"No se pudo abrir la entrada: {args.input}")
+        return 1
+
+    writer = OutputWriter(args.output, source.fps) if args.output else None
+    workers = None
+    tiler = None
+    try:
+        if args.workers > 0:
+            workers = ProcessingPool(graph_for_mode(args.mode), args.workers, args.backend, args.depth)
+            frames, elapsed, process_time = run_parallel(source, build_params(args), workers, writer,
+                                                         args.max_frames)
+        else:
+            if args.tiles > 1:
+                tiler = TiledExecutor(graph_for_mode(args.mode), args.tiles)
+            frames, elapsed, process_time = run(source, build_params(args), writer, args.max_frames, tiler)
+    finally:
+        source.release()
+        if workers is not None:
+            workers.close()
+        if tiler is not None:
+            tiler.close()
+        if writer is not None:
+            writer.close()
+
+    if frames == 0:
+        print("No se procesó ningún frame")
+        return 1
+    print(f"Frames: {frames} | Tiempo: {elapsed:.2f} s | FPS: {frames / elapsed:.1f} "
+          f"| FPS solo procesamiento: {frames / max(process_time, 1e-9):.1f}")
+    if workers is not None:
+        # Con workers, "solo procesamiento" es el ritmo de un worker (tiempo sumado de todos)
+        stats = workers.stats()
+        usage = ", ".join(f"{worker}: {value:.0%}" for worker, value in stats["utilization"].items())
+        print(f"Workers: {stats['workers']} ({stats['backend']}) | Cola media: {stats['average_queue_depth']:.1f}"
+              f"/{stats['depth']} | Uso: {usage}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""Tiempos por etapa, contadores y FPS de las aplicaciones.
+
+Instrumentation guarda, para cada etapa del ciclo de un frame, las últimas
+window duraciones medidas con time.perf_counter_ns (monotónico y de alta
+resolución) y calcula percentiles sobre esa ventana móvil:
+
+    capture  lectura de la fuente (hilo de FrameGrabber)
+    process  grafo de filtros
+    resize   reducción al tamaño de visualización
+    color    conversión a RGB
+    photo    copia al PhotoImage de Tk
+    paint    hasta que Tk termina los redibujos pendientes tras el paste
+    frame    intervalo entre frames mostrados (de aquí sale el FPS)
+
+Además de la ventana, cada etapa acumula desde el inicio un histograma con
+los límites de HISTOGRAM_BUCKETS (lo que exporta metrics.py). Los
+contadores (por ejemplo, dropped: frames que la cámara entregó y nadie
+mostró) también se acumulan desde el inicio. snapshot() devuelve todo
+como un diccionario y overlay_lines() como texto para dibujar sobre el
+video con draw_overlay. Se puede registrar desde cualquier hilo.
+
+Si tracer es un TraceRecorder (ver tracing.py), cada medición de una etapa
+también se agrega a la traza con su inicio y su hilo.
+"""
+import bisect
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+STAGES = ("capture", "process", "resize", "color", "photo", "paint", "frame")
+
+# Límites superiores de los histogramas, en segundos (más uno implícito +Inf)
+HISTOGRAM_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+_BUCKETS_NS = tuple(int(bound * 1e9) for bound in HISTOGRAM_BUCKETS)
+
+
+class _StageTimer:
+    """Context manager que registra la duración del bloque en una etapa"""
+    __slots__ = ("stats", "stage", "start")
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record_ns(self.stage, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Instrumentation:
+    """Duraciones recientes por etapa, contadores y FPS"""
+    def __init__(self, window=240):
+        self.window = window
+        self.samples = {stage: deque(maxlen=window) for stage in STAGES}
+        self.totals = {stage: 0 for stage in STAGES}  # Mediciones desde el inicio
+        self.buckets = {stage: [0] * (len(_BUCKETS_NS) + 1) for stage in STAGES}
+        self.sums = {stage: 0 for stage in STAGES}  # Nanosegundos acumulados
+        self.counters = {}
+        self.last_tick = None
+        self.tracer = None
+        self.lock = threading.Lock()
+
+    def stage(self, name):
+        """Mide un bloque: with stats.stage("process"): ..."""
+        return _StageTimer(self, name)
+
+    def record_ns(self, stage, nanoseconds, end_ns=None, trace=True):
+        """Registra una duración en nanosegundos.
+
+        end_ns es el instante (perf_counter_ns) en que terminó la etapa, por
+        defecto ahora; trace=False no la agrega a la traza (por ejemplo, si
+        se midió en otro hilo y no se sabe cuándo).
+        """
+        if trace and self.tracer is not None and self.tracer.enabled:
+            end = time.perf_counter_ns() if end_ns is None else end_ns
+            self.tracer.complete(stage, end - nanoseconds, nanoseconds)
+        with self.lock:
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+                self.totals[stage] = 0
+                self.buckets[stage] = [0] * (len(_BUCKETS_NS) + 1)
+                self.sums[stage] = 0
+            samples.append(nanoseconds)
+            self.totals[stage] += 1
+            self.buckets[stage][bisect.bisect_left(_BUCKETS_NS, nanoseconds)] += 1
+            self.sums[stage] += nanoseconds
+
+    def record(self, stage, seconds, trace=True):
+        """Registra una duración ya medida, en segundos"""
+        self.record_ns(stage, int(seconds * 1e9), trace=trace)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def tick(self):
+        """Marca un frame mostrado; el intervalo desde el anterior va a la etapa frame"""
+        now = time.perf_counter_ns()
+        if self.last_tick is not None:
+            self.record_ns("frame", now - self.last_tick, trace=False)
+        self.last_tick = now
+
+    def fps(self, frames=None):
+        """FPS según el intervalo medio de la ventana, o de los últimos frames (0 sin datos)"""
+        with self.lock:
+            intervals = list(self.samples["frame"])[-frames:] if frames else self.samples["frame"]
+            total = sum(intervals)
+            return len(intervals) * 1e9 / total if total else 0.0
+
+    def percentiles(self, stage):
+        """Resumen de la ventana de una etapa en milisegundos, o None si no hay mediciones"""
+        with self.lock:
+            samples = np.array(self.samples.get(stage, ()), dtype=np.float64)
+            total = self.totals.get(stage, 0)
+        if samples.size == 0:
+            return None
+        samples /= 1e6
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {
+            "count": total,
+            "last_ms": float(samples[-1]),
+            "mean_ms": float(samples.mean()),
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(samples.max()),
+        }
+
+    def histograms(self):
+        """Histogramas acumulados: {etapa: (conteos acumulados por límite y +Inf, suma en segundos)}"""
+        with self.lock:
+            result = {}
+            for stage, counts in self.buckets.items():
+                cumulative = []
+                total = 0
+                for count in counts:
+                    total += count
+                    cumulative.append(total)
+                result[stage] = (cumulative, self.sums[stage] / 1e9)
+            return result
+
+    def snapshot(self):
+        """Estado completo: {"fps", "stages": {etapa: percentiles}, "counters"}"""
+        stages = {}
+        for stage in list(self.samples):
+            summary = self.percentiles(stage)
+            if summary is not None:
+                stages[stage] = summary
+        with self.lock:
+            counters = dict(self.counters)
+        return {"fps": self.fps(), "stages": stages, "counters": counters}
+
+    def overlay_lines(self):
+        """Líneas de texto con FPS, contadores y percentiles de cada etapa"""
+        snapshot = self.snapshot()
+        header = f"FPS {snapshot['fps']:.1f}"
+        for name, value in sorted(snapshot["counters"].items()):
+            header += f" | {name} {value}"
+        lines = [header]
+        for stage, summary in snapshot["stages"].items():
+            if stage != "frame":
+                lines.append(f"{stage:<8} p50 {summary['p50_ms']:6.2f}  p90 {summary['p90_ms']:6.2f}  "
+                             f"p99 {summary['p99_ms']:6.2f} ms")
+        return lines
+
+
+def draw_overlay(image, lines, origin=(10, 20), scale=0.5, color=(0, 255, 0)):
+    """Dibuja las líneas sobre la imagen (en el lugar) con un fondo oscuro para que se lean"""
+    if not lines:
+        return image
+    line_height = int(28 * scale) + 4
+    width = max(cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)[0][0] for line in lines)
+    x, y = origin
+    top = max(0, y - line_height + 4)
+    bottom = min(image.shape[0], y + line_height * (len(lines) - 1) + 8)
+    region = image[top:bottom, max(0, x - 4):min(image.shape[1], x + width + 4)]
+    region //= 3  # Oscurecer el fondo del texto
+    if image.ndim == 2:
+        color = max(color)
+    for index, line in enumerate(lines):
+        cv2.putText(image, line, (x, y + index * line_height), cv2.FONT_HERSHEY_SIMPLEX, scale, color, 1,
+                    cv2.LINE_AA)
+    return image
@@ -0,0 +1,81 @@
+"""Operaciones puntuales de 8 bits como tablas de 256 entradas.
+
+Binarizar (cualquiera de los cinco tipos de cv2.threshold), corregir gamma
+o invertir dependen solo del valor de cada píxel, así que se pueden
+precalcular como una tabla y aplicar con cv2.LUT. Varias operaciones
+seguidas se componen en una sola tabla (t2[t1]) y cuestan una única pasada
+sobre la imagen.
+
+Las tablas se construyen una vez por combinación de parámetros (es decir,
+cuando se mueve un slider) y se guardan en un caché LRU.
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from buffers import pool_buffer
+
+IDENTITY = np.arange(256, dtype=np.uint8)
+
+
+def threshold_table(value, threshold_type):
+    """Tabla equivalente a cv2.threshold(x, value, 255, tipo) sobre uint8"""
+    x = np.arange(256)
+    above = x > value
+    if threshold_type == "BINARY":
+        table = np.where(above, 255, 0)
+    elif threshold_type == "BINARY_INV":
+        table = np.where(above, 0, 255)
+    elif threshold_type == "TRUNC":
+        table = np.where(above, min(max(value, 0), 255), x)
+    elif threshold_type == "TOZERO":
+        table = np.where(above, x, 0)
+    elif threshold_type == "TOZERO_INV":
+        table = np.where(above, 0, x)
+    else:
+        raise ValueError(f"Tipo de binarización desconocido: {threshold_type}")
+    return table.astype(np.uint8)
+
+
+def gamma_table(gamma):
+    """Corrección gamma: 255 * (x / 255) ** (1 / gamma). gamma > 1 aclara, < 1 oscurece"""
+    x = np.arange(256) / 255.0
+    return np.clip(np.rint(255.0 * x ** (1.0 / gamma)), 0, 255).astype(np.uint8)
+
+
+def invert_table():
+    return (255 - np.arange(256)).astype(np.uint8)
+
+
+TABLE_BUILDERS = {
+    "threshold": lambda args: threshold_table(args["value"], args["type"]),
+    "gamma": lambda args: gamma_table(args["gamma"]),
+    "invert": lambda args: invert_table(),
+}
+
+
+@lru_cache(maxsize=128)
+def chain_table(steps):
+    """Tabla de una cadena de operaciones, aplicadas en orden.
+
+    steps es una tupla de (nombre, ((parámetro, valor), ...)) para poder
+    usarla como clave del caché.
+    """
+    table = IDENTITY
+    for name, args in steps:
+        # Componer: primero table, después la operación siguiente
+        table = TABLE_BUILDERS[name](dict(args))[table]
+    table = np.ascontiguousarray(table, dtype=np.uint8)
+    table.flags.writeable = False  # Compartida por todos los que la piden
+    return table
+
+
+def step(name, args):
+    """Paso de cadena con los argumentos en una forma que sirve de clave"""
+    return name, tuple(sorted(args.items()))
+
+
+def apply_lut(image, table, pool=None, name="lut"):
+    """Aplica la tabla a cada píxel (y a cada canal en imágenes color)"""
+    return cv2.LUT(image, table, dst=pool_buffer(pool, name, image.shape))
@@ -0,0 +1,170 @@
+"""Exportación de métricas para ejecuciones largas.
+
+MetricsExporter reúne los datos de un objeto Instrumentation (histogramas
+de latencia por etapa, FPS, contadores), valores instantáneos que entrega
+la aplicación (ocupación del pool de buffers, escala de trabajo...), la
+memoria residente del proceso y los parámetros actuales. Los publica de
+dos formas, ambas opcionales:
+
+    serve(port)            endpoint HTTP local (GET /metrics) en el formato
+                           de texto de Prometheus
+    record_to(path, s)     agrega cada s segundos una línea JSON a path,
+                           con los parámetros para poder correlacionar
+                           (por ejemplo, el kernel del blur con la latencia)
+
+Ambas corren en hilos propios y solo leen: Instrumentation y ParamStore se
+pueden consultar desde cualquier hilo. Los valores de la aplicación los
+toma el hilo de la interfaz (las aplicaciones los refrescan con root.after)
+y gauges solo devuelve esa copia. Un error al armar o escribir un registro
+se informa por consola y el hilo sigue con el próximo intervalo.
+"""
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+
+from instrumentation import HISTOGRAM_BUCKETS
+
+PREFIX = "vision"
+
+
+def rss_bytes():
+    """Memoria residente del proceso en bytes, o None si no se puede obtener"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Sin /proc solo se conoce el máximo (en KiB en Linux, en bytes en macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsExporter:
+    """Métricas de una aplicación en formato Prometheus y como líneas JSON"""
+    def __init__(self, stats, gauges=None, params=None, prefix=PREFIX):
+        self.stats = stats
+        self.gauges = gauges or dict  # Función que devuelve {nombre: valor}
+        self.params = params  # Función que devuelve el snapshot de parámetros actual
+        self.prefix = prefix
+        self.server = None
+        self.recorder = None
+        self.errors = 0  # Registros JSONL que no se pudieron escribir
+        self.stop_event = threading.Event()
+
+    def collect_gauges(self):
+        gauges = dict(self.gauges())
+        gauges["fps"] = self.stats.fps()
+        rss = rss_bytes()
+        if rss is not None:
+            gauges["process_resident_memory_bytes"] = rss
+        return gauges
+
+    def prometheus_text(self):
+        """Todas las métricas en el formato de exposición de texto de Prometheus"""
+        p = self.prefix
+        lines = [f"# HELP {p}_stage_seconds Duración de cada etapa del ciclo de un frame",
+                 f"# TYPE {p}_stage_seconds histogram"]
+        for stage, (cumulative, total) in self.stats.histograms().items():
+            if not cumulative[-1]:
+                continue
+            for bound, count in zip(HISTOGRAM_BUCKETS, cumulative):
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {cumulative[-1]}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {cumulative[-1]}')
+
+        for name, value in sorted(self.stats.snapshot()["counters"].items()):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {value}")
+
+        for name, value in sorted(self.collect_gauges().items()):
+            lines.append(f"# TYPE {p}_{name} gauge")
+            lines.append(f"{p}_{name} {_format_number(value)}")
+
+        if self.params is not None:
+            # Los parámetros como etiquetas de una métrica constante (patrón "info")
+            labels = ",".join(f'{name}="{_label_value(value)}"' for name, value in self.params().items())
+            lines.append(f"# TYPE {p}_params_info gauge")
+            lines.append(f"{p}_params_info{{{labels}}} 1")
+        return "\n".join(lines) + "\n"
+
+    def json_record(self):
+        """Estado actual como diccionario serializable a JSON"""
+        snapshot = self.stats.snapshot()
+        record = {
+            "time": time.time(),
+            "fps": snapshot["fps"],
+            "stages": snapshot["stages"],
+            "counters": snapshot["counters"],
+            "gauges": self.collect_gauges(),
+        }
+        if self.params is not None:
+            record["params"] = dict(self.params().items())
+        return record
+
+    def serve(self, port, host="127.0.0.1"):
+        """Atiende GET /metrics en un hilo propio. Devuelve el puerto (útil con port=0)"""
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = exporter.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # No llenar la consola con una línea por consulta
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metricas-http", daemon=True).start()
+        return self.server.server_address[1]
+
+    def record_to(self, path, interval=10.0):
+        """Agrega un registro JSON a path cada interval segundos, en un hilo propio"""
+        def write(f):
+            try:
+                f.write(json.dumps(self.json_record()) + "\n")
+                f.flush()
+            except Exception as error:  # Un registro fallido no debe terminar el hilo
+                self.errors += 1
+                print(f"Métricas: no se pudo escribir el registro en {path}: {error!r}", file=sys.stderr)
+
+        def run():
+            with open(path, "a", encoding="utf-8") as f:
+                while not self.stop_event.wait(interval):
+                    write(f)
+                # Un último registro al cerrar
+                write(f)
+
+        self.recorder = threading.Thread(target=run, name="metricas-jsonl", daemon=True)
+        self.recorder.start()
+
+    def close(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.recorder is not None:
+            self.recorder.join(timeout=1.0)
@@ -0,0 +1,134 @@
+"""Varias fuentes procesadas a la vez y mostradas en mosaico.
+
+MultiSource abre cada fuente con su propio FrameGrabber y compone los
+resultados en una sola imagen BGR (mosaic), una celda por fuente con su
+FPS escrito encima. Cada fuente tiene su BufferPool: los resultados de una
+no pisan los de otra antes de copiarlos al mosaico.
+
+Reparto de la CPU (step): en cada vuelta se atienden las fuentes con frame
+nuevo empezando por la que se atendió hace más tiempo. Con un presupuesto
+(budget, en segundos) se deja de procesar al agotarlo y las que quedaron
+sin atender son las primeras en la vuelta siguiente. Así, cuando la CPU no
+alcanza, todas las fuentes bajan al mismo ritmo en lugar de que la primera
+de la lista se quede con todo. Las aplicaciones combinan esto con un único
+ResolutionGovernor, que reduce la resolución de todas por igual.
+"""
+import math
+import time
+
+import numpy as np
+
+from buffers import BufferPool
+from capture import FrameGrabber
+from display import paste_tile
+from instrumentation import Instrumentation
+from sources import open_source
+
+
+def grid_shape(count):
+    """(filas, columnas) de la grilla más cuadrada posible para count celdas"""
+    columns = math.ceil(math.sqrt(count))
+    return math.ceil(count / columns), columns
+
+
+class SourceSlot:
+    """Una fuente del mosaico: su captura, sus buffers y su FPS"""
+    def __init__(self, index, uri):
+        self.index = index
+        self.uri = uri
+        self.cap = open_source(uri)
+        self.grabber = None
+        self.pool = BufferPool()
+        self.stats = Instrumentation(window=60)
+        self.last_sequence = 0
+        self.last_served = 0.0
+        self.skipped = 0  # Vueltas en que tenía frame nuevo y no alcanzó el presupuesto
+
+
+class MultiSource:
+    """N fuentes con captura propia, repartidas con justicia y compuestas en mosaico"""
+    def __init__(self, uris, max_width=1280, stats=None):
+        self.uris = list(uris)
+        self.max_width = max_width  # Ancho máximo del mosaico
+        self.stats = stats  # Instrumentation de la aplicación (captura y descartes de todas)
+        self.slots = []
+        self.rows, self.columns = grid_shape(len(self.uris))
+        self.tile_width = self.tile_height = 0
+        self.width = self.height = 0
+        self.mosaic = None
+
+    def start(self):
+        """Abre todas las fuentes. Devuelve False (y cierra las abiertas) si alguna falla"""
+        for index, uri in enumerate(self.uris):
+            slot = SourceSlot(index, uri)
+            self.slots.append(slot)
+            if not slot.cap.isOpened():
+                print(f"No se pudo abrir la fuente {uri}")
+                self.close()
+                return False
+            slot.grabber = FrameGrabber(slot.cap, stats=self.stats)
+            if not slot.grabber.start():
+                print(f"No se pudo leer de la fuente {uri}")
+                self.close()
+                return False
+        # Celdas con la proporción de la primera fuente, sin agrandar la más grande
+        first = self.slots[0].cap
+        source_width = max(slot.cap.width for slot in self.slots)
+        self.tile_width = min(source_width, self.max_width // self.columns) // 2 * 2
+        self.tile_height = int(self.tile_width * first.height / first.width) // 2 * 2
+        self.width = self.tile_width * self.columns
+        self.height = self.tile_height * self.rows
+        self.mosaic = np.zeros((self.height, self.width, 3), np.uint8)
+        return True
+
+    @property
+    def max_scale(self):
+        """Escala de trabajo por encima de la cual el detalle no entra en una celda"""
+        return min(1.0, self.tile_width / max(slot.cap.width for slot in self.slots))
+
+    def step(self, process, budget=0.0):
+        """Procesa las fuentes con frame nuevo, de la atendida hace más tiempo a la más reciente.
+
+        process(frame, pool) devuelve la imagen procesada. Con budget > 0 se
+        deja de procesar al superar budget segundos (siempre se atiende al
+        menos una). Devuelve (atendidas, sin atender, segundos de proceso).
+        """
+        ready = [slot for slot in self.slots if slot.grabber.sequence != slot.last_sequence]
+        ready.sort(key=lambda slot: slot.last_served)
+        start = time.perf_counter()
+        served = 0
+        process_time = 0.0
+        for slot in ready:
+            if budget > 0 and served and time.perf_counter() - start >= budget:
+                slot.skipped += 1
+                continue
+            frame, sequence, _ = slot.grabber.read_latest()
+            slot.last_sequence = sequence
+            process_start = time.perf_counter()
+            processed = process(frame, slot.pool)
+            process_time += time.perf_counter() - process_start
+            slot.stats.tick()
+            slot.last_served = time.monotonic()
+            self.place(slot, processed)
+            served += 1
+        return served, len(ready) - served, process_time
+
+    def place(self, slot, image):
+        """Copia la imagen procesada a la celda de la fuente, con su FPS"""
+        row, column = divmod(slot.index, self.columns)
+        paste_tile(self.mosaic, column * self.tile_width, row * self.tile_height, self.tile_width,
+                   self.tile_height, image, slot.pool, "tile", f"{slot.index + 1}: {slot.stats.fps():.1f} FPS")
+
+    def fps(self):
+        """FPS de cada fuente, en orden"""
+        return [slot.stats.fps() for slot in self.slots]
+
+    def skipped(self):
+        return sum(slot.skipped for slot in self.slots)
+
+    def close(self):
+        for slot in self.slots:
+            if slot.grabber is not None:
+                slot.grabber.stop()
+            else:
+                slot.cap.release()
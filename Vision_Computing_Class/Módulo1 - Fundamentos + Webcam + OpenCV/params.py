@@ -0,0 +1,86 @@
+"""Parámetros publicados por la interfaz y leídos por el pipeline.
+
+Leer una variable de Tk (IntVar.get, ...) es una llamada al intérprete de
+Tcl que solo puede hacerse desde el hilo de la interfaz. Los callbacks de
+los controles publican en cambio un ParamSnapshot nuevo en un ParamStore,
+y el pipeline (en el hilo que sea) lee el snapshot actual sin bloqueos:
+reemplazar la referencia es atómico y el snapshot nunca se modifica.
+"""
+import threading
+
+
+class ParamSnapshot:
+    """Valores de todos los parámetros en un instante, inmutable.
+
+    Se usa como un diccionario de solo lectura: snapshot["mode"].
+    version aumenta con cada publicación y permite detectar cambios.
+    """
+    __slots__ = ("names", "values", "version")
+
+    def __init__(self, names, values, version=0):
+        object.__setattr__(self, "names", names)  # {nombre: índice}, compartido entre versiones
+        object.__setattr__(self, "values", tuple(values))
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ParamSnapshot es inmutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("ParamSnapshot es inmutable")
+
+    def __getitem__(self, name):
+        return self.values[self.names[name]]
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, name, default=None):
+        index = self.names.get(name)
+        return default if index is None else self.values[index]
+
+    def keys(self):
+        return self.names.keys()
+
+    def items(self):
+        return zip(self.names, self.values)
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def replace(self, **changes):
+        """Nuevo snapshot con algunos valores cambiados y la versión siguiente"""
+        unknown = set(changes) - set(self.names)
+        if unknown:
+            raise KeyError(f"Parámetros desconocidos: {', '.join(sorted(unknown))}")
+        values = list(self.values)
+        for name, value in changes.items():
+            values[self.names[name]] = value
+        return ParamSnapshot(self.names, values, self.version + 1)
+
+    def __repr__(self):
+        return f"ParamSnapshot(v{self.version}, {self.as_dict()})"
+
+
+class ParamStore:
+    """Snapshot actual de los parámetros.
+
+    publish() se llama desde los callbacks de la interfaz; snapshot se puede
+    leer desde cualquier hilo sin tomar el lock.
+    """
+    def __init__(self, values):
+        names = {name: index for index, name in enumerate(values)}
+        self.snapshot = ParamSnapshot(names, values.values())
+        self.lock = threading.Lock()  # Solo serializa a quienes publican
+
+    def publish(self, **changes):
+        """Publica un snapshot con los cambios. Devuelve el snapshot nuevo"""
+        with self.lock:
+            snapshot = self.snapshot.replace(**changes)
+            self.snapshot = snapshot
+        return snapshot
@@ -0,0 +1,320 @@
+"""Captura, filtros e interfaz en procesos separados.
+
+    proceso de captura   lee la fuente directamente en un slot libre del
+                         anillo de entrada y envía su índice al filtro
+    proceso de filtro    ejecuta el grafo sobre el slot, escribe el
+                         resultado en un slot del anillo de salida y libera
+                         el de entrada
+    proceso principal    (Tk) muestra el último resultado y libera su slot
+
+Los frames viven en dos SharedFrameRing; por las colas solo pasan índices,
+el número de secuencia y la forma del resultado. Los parámetros se envían
+al filtro solo cuando cambia la versión del snapshot.
+
+Los slots de salida se dimensionan con la salida más grande del grafo
+(todos sus modos con los parámetros por defecto). Si con otros parámetros
+el resultado no entra (por ejemplo un resize con escala mayor), el filtro
+lo descarta y lo informa: la interfaz lo cuenta en stats()["oversized"] y
+avisa una vez por consola. El anillo de entrada se dimensiona con el primer
+frame: si la fuente cambia de resolución, la captura descarta los frames
+que no entran en un slot (contador dropped) y avisa una vez.
+"""
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from buffers import BufferPool
+from governor import resize_to_scale
+from graph import FilterGraph
+from shared_frames import SharedFrameRing
+from sources import open_source
+
+
+def _put_latest(frames, item, ring):
+    """Encola item; si la cola está llena descarta el frame más antiguo y libera su slot"""
+    try:
+        frames.put_nowait(item)
+        return 0
+    except queue.Full:
+        pass
+    try:
+        ring.release(frames.get_nowait()[0])
+    except queue.Empty:
+        pass
+    try:
+        frames.put_nowait(item)
+    except queue.Full:
+        ring.release(item[0])
+    return 1
+
+
+def _capture_main(source_uri, lock, info, setup, frames, stop, dropped):
+    # Al terminar no esperar a que alguien vacíe la cola
+    frames.cancel_join_thread()
+    source = open_source(source_uri)
+    ret, first = source.read() if source.isOpened() else (False, None)
+    if not ret:
+        info.put(None)
+        source.release()
+        return
+    info.put((first.shape, source.fps))
+    spec = setup.get()
+    if spec is None:
+        source.release()
+        return
+    ring = SharedFrameRing.attach(spec, lock)
+
+    sequence = 0
+    scratch = None
+    pending = first
+    resized = False
+    while not stop.is_set() and source.isOpened():
+        index = ring.acquire()
+        if index is None:
+            # Todos los slots en uso: seguir leyendo para no atrasarse, sin publicar
+            ret, scratch = source.read(scratch)
+            with dropped.get_lock():
+                dropped.value += 1
+            continue
+        slot = ring.view(index)
+        if pending is not None:
+            slot[...] = pending
+            pending = None
+            ret = True
+        else:
+            ret, image = source.read(slot)
+            if ret and image is not slot:
+                # La fuente devolvió otro arreglo en lugar de escribir en el slot
+                if image.shape != slot.shape:
+                    if not resized:
+                        resized = True
+                        print(f"La fuente cambió a {image.shape[1]}x{image.shape[0]}, pero el anillo es de "
+                              f"{slot.shape[1]}x{slot.shape[0]}: los frames se descartan")
+                    del slot, image
+                    ring.release(index)
+                    with dropped.get_lock():
+                        dropped.value += 1
+                    continue
+                slot[...] = image
+            image = None
+        del slot
+        if not ret:
+            ring.release(index)
+            # La fuente sigue abierta pero no entrega: no girar en vacío
+            time.sleep(0.005)
+            continue
+        sequence += 1
+        if _put_latest(frames, (index, sequence, time.monotonic()), ring):
+            with dropped.get_lock():
+                dropped.value += 1
+    source.release()
+    ring.close()
+
+
+def _filter_main(spec, input_lock, output_lock, setup, frames, results, control, stop):
+    results.cancel_join_thread()
+    graph = FilterGraph(spec)
+    pool = BufferPool()
+    ring_specs = setup.get()
+    if ring_specs is None:
+        return
+    inputs = SharedFrameRing.attach(ring_specs[0], input_lock)
+    outputs = SharedFrameRing.attach(ring_specs[1], output_lock)
+    params = graph.defaults()
+    version = -1
+    scale = 1.0
+
+    while not stop.is_set():
+        # Aplicar los últimos parámetros y escala recibidos
+        while True:
+            try:
+                kind, value, value_version = control.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "params":
+                params, version = value, value_version
+            elif kind == "scale":
+                scale = value
+        try:
+            item = frames.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        index, sequence, timestamp = item
+        start = time.perf_counter()
+        frame = inputs.view(index)
+        if scale < 1.0:
+            frame = resize_to_scale(frame, scale, pool)
+        processed = graph.process(frame, params, pool)
+
+        shape = processed.shape
+        if processed.nbytes > outputs.slot_bytes:
+            # No entra en un slot de salida: se descarta y se avisa a la interfaz
+            del frame, processed
+            inputs.release(index)
+            results.put((None, sequence, timestamp, shape, version, time.perf_counter() - start))
+            continue
+        output = outputs.acquire()
+        if output is not None:
+            outputs.view(output, shape)[...] = processed
+        del frame, processed
+        inputs.release(index)
+        if output is None:
+            # La interfaz todavía no liberó ningún resultado: se descarta este frame
+            continue
+        results.put((output, sequence, timestamp, shape, version, time.perf_counter() - start))
+    inputs.close()
+    outputs.close()
+
+
+class ProcessPipeline:
+    """Lanza los procesos de captura y filtro y entrega los resultados a la interfaz"""
+    def __init__(self, source_uri, graph, input_slots=4, output_slots=3):
+        # spawn funciona igual en Windows y Linux y no hereda Tk ni otros hilos
+        self.context = multiprocessing.get_context("spawn")
+        self.source_uri = source_uri
+        self.graph = graph
+        self.input_slots = input_slots
+        self.output_slots = output_slots
+        self.inputs = None
+        self.outputs = None
+        self.width = self.height = 0
+        self.fps = 0.0
+        self.processes = []
+        self.params_sent = {}  # version -> snapshot enviado y aún sin resultado
+        self.last_version = None
+        self.scale = 1.0
+        self.displayed = 0
+        self.oversized = 0  # Resultados descartados por no entrar en un slot de salida
+        self.oversized_shape = None
+
+    def start(self, timeout=10.0):
+        """Arranca los procesos. Devuelve False si la fuente no se pudo abrir"""
+        ctx = self.context
+        self.input_lock = ctx.Lock()
+        self.output_lock = ctx.Lock()
+        self.stop_event = ctx.Event()
+        self.capture_dropped = ctx.Value("q", 0)
+        info = ctx.Queue()
+        capture_setup = ctx.Queue()
+        filter_setup = ctx.Queue()
+        # Cola corta: el filtro siempre toma frames recientes
+        self.frames = ctx.Queue(maxsize=2)
+        self.results = ctx.Queue()
+        self.control = ctx.Queue()
+
+        self.processes = [
+            ctx.Process(target=_capture_main, name="captura", daemon=True,
+                        args=(self.source_uri, self.input_lock, info, capture_setup, self.frames,
+                              self.stop_event, self.capture_dropped)),
+            ctx.Process(target=_filter_main, name="filtro", daemon=True,
+                        args=(self.graph.spec, self.input_lock, self.output_lock, filter_setup, self.frames,
+                              self.results, self.control, self.stop_event)),
+        ]
+        for process in self.processes:
+            process.start()
+
+        # La captura informa la forma del frame; con ella se dimensionan los slots
+        try:
+            first = info.get(timeout=timeout)
+        except queue.Empty:
+            first = None
+        if first is None:
+            capture_setup.put(None)
+            filter_setup.put(None)
+            self.stop()
+            return False
+        shape, self.fps = first
+        self.height, self.width = shape[:2]
+        self.inputs = SharedFrameRing(self.input_slots, shape, self.input_lock)
+        self.outputs = SharedFrameRing(self.output_slots, self.output_shape(shape), self.output_lock)
+        capture_setup.put(self.inputs.spec())
+        filter_setup.put((self.inputs.spec(), self.outputs.spec()))
+        return True
+
+    def output_shape(self, shape):
+        """Forma de los slots de salida: la mayor entre un frame BGR y las salidas del grafo"""
+        # Los resultados pueden ser grises o color: como mínimo un frame BGR
+        largest = (shape[0], shape[1], 3)
+        frame = np.zeros(shape, np.uint8)
+        defaults = self.graph.defaults()
+        for mode in self.graph.modes:
+            output = self.graph.process(frame, dict(defaults, mode=mode))
+            if output.nbytes > int(np.prod(largest)):
+                largest = output.shape
+        return largest
+
+    def set_params(self, snapshot):
+        """Envía el snapshot al filtro si cambió desde el último envío"""
+        if snapshot.version != self.last_version:
+            self.last_version = snapshot.version
+            self.params_sent[snapshot.version] = snapshot
+            self.control.put(("params", snapshot.as_dict(), snapshot.version))
+
+    def set_scale(self, scale):
+        """Escala de trabajo del filtro (modo adaptativo)"""
+        if scale != self.scale:
+            self.scale = scale
+            self.control.put(("scale", scale, None))
+
+    def latest(self):
+        """Último resultado disponible: (vista, sequence, params, segundos, slot) o None.
+
+        Los resultados anteriores se descartan. La vista es válida hasta release(slot).
+        """
+        latest = None
+        while True:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] is None:
+                self._report_oversized(item[3])
+                continue
+            if latest is not None:
+                self.outputs.release(latest[0])
+            latest = item
+        if latest is None:
+            return None
+        index, sequence, timestamp, shape, version, seconds = latest
+        params = self.params_sent.get(version)
+        if params is None:
+            # Procesado antes de recibir el primer snapshot de la interfaz
+            self.outputs.release(index)
+            return None
+        # Olvidar los snapshots más viejos que el usado por este resultado
+        for old in [v for v in self.params_sent if v < version]:
+            del self.params_sent[old]
+        self.displayed += 1
+        return self.outputs.view(index, shape), sequence, params, seconds, index
+
+    def _report_oversized(self, shape):
+        self.oversized += 1
+        if shape != self.oversized_shape:
+            self.oversized_shape = shape
+            print(f"El resultado {shape} no entra en los slots de salida {self.outputs.frame_shape}: "
+                  f"se descarta")
+
+    def release(self, index):
+        self.outputs.release(index)
+
+    def stats(self):
+        return {
+            "input_free": self.inputs.free_slots if self.inputs else 0,
+            "output_free": self.outputs.free_slots if self.outputs else 0,
+            "capture_dropped": self.capture_dropped.value,
+            "displayed": self.displayed,
+            "oversized": self.oversized,
+        }
+
+    def stop(self):
+        """Detiene los procesos y libera la memoria compartida"""
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for ring in (self.inputs, self.outputs):
+            if ring is not None:
+                ring.close()
@@ -0,0 +1,103 @@
+"""Operaciones de procesamiento de imágenes independientes de la interfaz.
+
+Cada función aplica una sola etapa (escala de grises, Canny, Sobel, blur,
+binarización) con parámetros explícitos. El grafo de filtros (graph.py)
+las combina para formar los modos de la aplicación en tiempo real (app.py).
+
+Si se pasa un BufferPool, el resultado se escribe en el buffer name del
+pool (y los temporales en name_x, name_y...) en lugar de reservar memoria.
+"""
+import cv2
+import numpy as np
+
+from blur import BLUR_ENGINES, box_blur, pyramid_blur, resolve_engine, separable_blur
+from buffers import pool_buffer
+from lut import apply_lut, chain_table, step
+
+# Motores para la magnitud del gradiente de Sobel:
+#   float64  referencia, sqrt(gx² + gy²) en doble precisión
+#   float32  cv2.magnitude en precisión simple (mitad de memoria que float64)
+#   int16    aproximación L1 |gx| + |gy| en enteros, la más rápida
+SOBEL_ENGINES = ("float64", "float32", "int16")
+
+THRESHOLD_TYPES = {
+    "BINARY": cv2.THRESH_BINARY,
+    "BINARY_INV": cv2.THRESH_BINARY_INV,
+    "TRUNC": cv2.THRESH_TRUNC,
+    "TOZERO": cv2.THRESH_TOZERO,
+    "TOZERO_INV": cv2.THRESH_TOZERO_INV
+}
+
+
+def odd_kernel(value, maximum):
+    """Asegura que el tamaño de kernel sea impar y esté entre 1 y maximum"""
+    kernel_size = int(float(value))
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    if kernel_size < 1:
+        kernel_size = 1
+    if kernel_size > maximum:
+        kernel_size = maximum
+    return kernel_size
+
+
+def to_gray(frame, pool=None, name="gray"):
+    """Convierte BGR a escala de grises (una imagen que ya es gris se devuelve tal cual)"""
+    if frame.ndim == 2:
+        return frame
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=pool_buffer(pool, name, frame.shape[:2]))
+
+
+def canny(gray, threshold1, threshold2, pool=None, name="canny"):
+    """Bordes de Canny sobre una imagen en escala de grises"""
+    return cv2.Canny(gray, threshold1, threshold2, edges=pool_buffer(pool, name, gray.shape))
+
+
+def sobel_magnitude(gray, kernel_size, scale, delta, engine="float32", pool=None, name="sobel"):
+    """Magnitud del gradiente de Sobel como uint8, saturando en 255"""
+    shape = gray.shape
+
+    if engine == "int16":
+        # |gx| + |gy| sobre int16; convertScaleAbs y add saturan a 255.
+        # Sobreestima la magnitud euclidiana como máximo en un factor sqrt(2).
+        sobelx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, dst=pool_buffer(pool, name + "_x", shape, np.int16),
+                           ksize=kernel_size, scale=scale, delta=delta)
+        sobely = cv2.Sobel(gray, cv2.CV_16S, 0, 1, dst=pool_buffer(pool, name + "_y", shape, np.int16),
+                           ksize=kernel_size, scale=scale, delta=delta)
+        abs_x = cv2.convertScaleAbs(sobelx, dst=pool_buffer(pool, name, shape))
+        abs_y = cv2.convertScaleAbs(sobely, dst=pool_buffer(pool, name + "_abs_y", shape))
+        return cv2.add(abs_x, abs_y, dst=abs_x)
+
+    if engine == "float64":
+        ddepth, dtype = cv2.CV_64F, np.float64
+    elif engine == "float32":
+        ddepth, dtype = cv2.CV_32F, np.float32
+    else:
+        raise ValueError(f"Motor de Sobel desconocido: {engine}")
+
+    # Aplicar Sobel en X e Y y combinar magnitudes
+    sobelx = cv2.Sobel(gray, ddepth, 1, 0, dst=pool_buffer(pool, name + "_x", shape, dtype),
+                       ksize=kernel_size, scale=scale, delta=delta)
+    sobely = cv2.Sobel(gray, ddepth, 0, 1, dst=pool_buffer(pool, name + "_y", shape, dtype),
+                       ksize=kernel_size, scale=scale, delta=delta)
+    magnitude = cv2.magnitude(sobelx, sobely, magnitude=sobelx if pool is not None else None)
+    return cv2.convertScaleAbs(magnitude, dst=pool_buffer(pool, name, shape))
+
+
+def gaussian_blur(frame, kernel_size, sigma_x, engine="auto", pool=None, name="blurred"):
+    """Blur Gaussiano con un kernel cuadrado de lado impar (motores en blur.py)"""
+    engine = resolve_engine(kernel_size, sigma_x, engine)
+    if engine == "box":
+        return box_blur(frame, kernel_size, sigma_x, pool, name)
+    if engine == "separable":
+        return separable_blur(frame, kernel_size, sigma_x, pool, name)
+    if engine == "pyramid":
+        return pyramid_blur(frame, kernel_size, sigma_x, pool, name)
+    return cv2.GaussianBlur(frame, (kernel_size, kernel_size), sigma_x,
+                            dst=pool_buffer(pool, name, frame.shape))
+
+
+def threshold(gray, value, threshold_type, pool=None, name="binary"):
+    """Binariza una imagen en escala de grises con una tabla precalculada (ver lut.py)"""
+    table = chain_table((step("threshold", {"value": value, "type": threshold_type}),))
+    return apply_lut(gray, table, pool, name)
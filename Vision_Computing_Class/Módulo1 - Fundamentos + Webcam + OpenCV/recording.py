@@ -0,0 +1,195 @@
+"""Grabación del video procesado en un hilo propio.
+
+Codificar en el hilo de la interfaz le quitaría a cada frame el tiempo de
+la compresión. Recorder recibe los frames procesados en una cola acotada y
+un hilo los escribe con cv2.VideoWriter. Si el codificador no da abasto,
+la política decide qué pasa con la cola llena:
+
+    drop    el frame nuevo no se graba (la interfaz nunca espera)
+    block   la interfaz espera a que se libere un lugar (no se pierde nada
+            mientras el codificador avance; tras SUBMIT_TIMEOUT segundos
+            el frame se descarta para no congelar la interfaz)
+
+La grabación se puede partir en segmentos de segment_seconds segundos o
+segment_mb megabytes (archivo_000.mp4, archivo_001.mp4...); también se
+empieza un segmento nuevo si cambia el tamaño del frame, por ejemplo en
+modo adaptativo. Si el OpenCV instalado lo permite, se pide al backend
+FFmpeg un codificador por hardware y, si no hay, se usa el de software.
+
+Si un archivo no se puede abrir o el codificador falla, la grabación se
+detiene: error guarda la excepción y submit deja de aceptar frames.
+"""
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+POLICIES = ("drop", "block")
+# Extensión del archivo -> fourcc del codificador
+VIDEO_EXTENSIONS = {".mp4": "mp4v", ".avi": "MJPG", ".mkv": "MJPG", ".mov": "mp4v"}
+SUBMIT_TIMEOUT = 1.0  # Espera máxima de submit con la política block, en segundos
+
+
+def open_writer(path, fourcc, fps, size, color, hardware=True):
+    """Abre un VideoWriter. Devuelve (writer, usa aceleración por hardware); OSError si no se pudo"""
+    code = cv2.VideoWriter_fourcc(*fourcc)
+    if hardware and hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+        writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, code, fps, size,
+                                 [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                                  cv2.VIDEOWRITER_PROP_IS_COLOR, int(color)])
+        if writer.isOpened():
+            accelerated = writer.get(cv2.VIDEOWRITER_PROP_HW_ACCELERATION) != cv2.VIDEO_ACCELERATION_NONE
+            return writer, accelerated
+        writer.release()
+    writer = cv2.VideoWriter(path, code, fps, size, color)
+    if not writer.isOpened():
+        writer.release()
+        raise OSError(f"No se pudo abrir {path} para grabar ({fourcc}, {size[0]}x{size[1]})")
+    return writer, False
+
+
+class Recorder:
+    """Graba frames en segundo plano a través de una cola acotada"""
+    def __init__(self, path, fps=30.0, policy="drop", queue_size=32, segment_seconds=0.0, segment_mb=0.0,
+                 hardware=True, stats=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Política de grabación desconocida: {policy}")
+        self.base, self.extension = os.path.splitext(path)
+        self.fourcc = VIDEO_EXTENSIONS.get(self.extension.lower())
+        if self.fourcc is None:
+            raise ValueError(f"Formato de video no soportado: {self.extension or path}")
+        self.fps = fps if fps > 0 else 30.0
+        self.policy = policy
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = int(segment_mb * 1024 * 1024)
+        self.hardware = hardware
+        self.stats = stats  # Instrumentation opcional: etapa encode y contador record_dropped
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writer = None
+        self.segment_key = None  # (ancho, alto, color) del segmento abierto
+        self.segment_start = 0.0
+        self.paths = []  # Archivos escritos, en orden
+        self.accelerated = False
+        self.written = 0
+        self.dropped = 0
+        self.encode_time = 0.0  # Segundos dedicados a escribir frames
+        self.first_write = None
+        self.error = None  # Excepción que detuvo la grabación
+        self.closing = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="grabacion", daemon=True)
+        self.thread.start()
+
+    def submit(self, frame):
+        """Encola una copia del frame. Devuelve False si se descartó (cola llena o grabación detenida)"""
+        if self.error is not None or self.closing.is_set():
+            return False
+        if self.policy == "drop" and self.queue.full():
+            # Descartar antes de copiar: con la cola llena la copia sería trabajo perdido
+            return self._drop()
+        # El frame suele ser un buffer del pool que se sobrescribe en el próximo ciclo
+        frame = frame.copy()
+        try:
+            if self.policy == "block":
+                self.queue.put(frame, timeout=SUBMIT_TIMEOUT)
+            else:
+                self.queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            return self._drop()
+
+    def _drop(self):
+        self.dropped += 1
+        if self.stats is not None:
+            self.stats.count("record_dropped")
+        return False
+
+    def _segment_path(self):
+        if not self.segment_seconds and not self.segment_bytes and not self.paths:
+            return self.base + self.extension
+        return f"{self.base}_{len(self.paths):03d}{self.extension}"
+
+    def _needs_segment(self, key):
+        if self.writer is None or key != self.segment_key:
+            return True
+        if self.segment_seconds and time.monotonic() - self.segment_start >= self.segment_seconds:
+            return True
+        if self.segment_bytes and self.written % 30 == 0:
+            # El tamaño del archivo se consulta cada 30 frames
+            return os.path.getsize(self.paths[-1]) >= self.segment_bytes
+        return False
+
+    def _open_segment(self, key):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+        if len(self.paths) == 1 and self.paths[0] == self.base + self.extension:
+            # La grabación empezó sin segmentos (cambió el tamaño): renombrar el primero
+            first = f"{self.base}_000{self.extension}"
+            os.replace(self.paths[0], first)
+            self.paths[0] = first
+        width, height, color = key
+        path = self._segment_path()
+        # Si falla, la excepción llega a _run y detiene la grabación sin agregar el archivo
+        self.writer, self.accelerated = open_writer(path, self.fourcc, self.fps, (width, height), color,
+                                                    self.hardware)
+        self.paths.append(path)
+        self.segment_key = key
+        self.segment_start = time.monotonic()
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    frame = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    # close espera a que la cola se vacíe
+                    if self.closing.is_set():
+                        break
+                    continue
+                start = time.perf_counter()
+                key = (frame.shape[1], frame.shape[0], frame.ndim == 3)
+                if self._needs_segment(key):
+                    self._open_segment(key)
+                self.writer.write(frame)
+                elapsed = time.perf_counter() - start
+                self.encode_time += elapsed
+                self.written += 1
+                if self.first_write is None:
+                    self.first_write = start
+                if self.stats is not None:
+                    self.stats.record("encode", elapsed)
+        except Exception as error:
+            self.error = error
+        finally:
+            if self.writer is not None:
+                self.writer.release()
+                self.writer = None
+
+    @property
+    def backlog(self):
+        return self.queue.qsize()
+
+    def report(self):
+        """Frames escritos y descartados, cola, segmentos y ritmo del codificador"""
+        elapsed = time.perf_counter() - self.first_write if self.first_write is not None else 0.0
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "backlog": self.backlog,
+            "capacity": self.queue.maxsize,
+            "segments": len(self.paths),
+            "accelerated": self.accelerated,
+            "error": str(self.error) if self.error is not None else None,
+            "written_fps": self.written / elapsed if elapsed > 0 else 0.0,
+            # Frames por segundo que el codificador podría escribir si no esperara frames
+            "encode_fps": self.written / self.encode_time if self.encode_time > 0 else 0.0,
+        }
+
+    def close(self):
+        """Escribe lo que quedó en la cola y cierra el archivo"""
+        # Sin centinela en la cola: con la cola llena y el hilo detenido, put quedaría esperando
+        self.closing.set()
+        self.thread.join()
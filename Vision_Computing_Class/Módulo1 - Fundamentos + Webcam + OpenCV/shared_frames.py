@@ -0,0 +1,92 @@
+"""Frames en memoria compartida entre procesos.
+
+SharedFrameRing reserva un bloque de multiprocessing.shared_memory con un
+número fijo de slots del tamaño de un frame. Cada proceso ve los slots como
+arreglos de NumPy sin copiarlos, y entre procesos solo viajan índices.
+
+Cada slot tiene un contador de referencias (en la misma memoria compartida,
+protegido por un Lock): acquire entrega un slot libre con contador 1, quien
+lo recibe lo libera con release, y retain agrega referencias si hay varios
+lectores. Un slot no vuelve a escribirse hasta que su contador llega a 0,
+así que un consumidor lento nunca ve su frame sobrescrito.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedFrameRing:
+    """Slots de frames en memoria compartida con contador de referencias"""
+    def __init__(self, slots, frame_shape, lock, dtype=np.uint8, name=None):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.lock = lock  # multiprocessing.Lock compartido por todos los procesos
+        self.slot_bytes = int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        size = slots * self.slot_bytes + slots * 8  # Frames y, al final, los contadores
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.refcounts = np.ndarray((slots,), np.int64, buffer=self.memory.buf,
+                                    offset=slots * self.slot_bytes)
+        if self.owner:
+            self.refcounts[:] = 0
+        self.next_slot = 0
+
+    def spec(self):
+        """Datos para abrir el mismo bloque desde otro proceso (ver attach)"""
+        return {"name": self.memory.name, "slots": self.slots,
+                "frame_shape": self.frame_shape, "dtype": self.dtype.str}
+
+    @classmethod
+    def attach(cls, spec, lock):
+        return cls(spec["slots"], spec["frame_shape"], lock, spec["dtype"], spec["name"])
+
+    def acquire(self):
+        """Reserva un slot libre (contador 1). Devuelve su índice o None si todos están en uso"""
+        with self.lock:
+            for offset in range(self.slots):
+                index = (self.next_slot + offset) % self.slots
+                if self.refcounts[index] == 0:
+                    self.refcounts[index] = 1
+                    self.next_slot = (index + 1) % self.slots
+                    return index
+        return None
+
+    def retain(self, index, count=1):
+        """Agrega referencias a un slot ya reservado"""
+        with self.lock:
+            if self.refcounts[index] <= 0:
+                raise ValueError(f"El slot {index} no está reservado")
+            self.refcounts[index] += count
+
+    def release(self, index):
+        """Quita una referencia; con 0 el slot vuelve a estar libre"""
+        with self.lock:
+            if self.refcounts[index] <= 0:
+                raise ValueError(f"El slot {index} ya estaba libre")
+            self.refcounts[index] -= 1
+
+    def view(self, index, shape=None):
+        """Arreglo de NumPy sobre el slot (sin copia). shape puede ser menor que el frame"""
+        shape = self.frame_shape if shape is None else tuple(shape)
+        if int(np.prod(shape)) * self.dtype.itemsize > self.slot_bytes:
+            raise ValueError(f"La forma {shape} no entra en un slot de {self.frame_shape}")
+        return np.ndarray(shape, self.dtype, buffer=self.memory.buf, offset=index * self.slot_bytes)
+
+    @property
+    def free_slots(self):
+        return int(np.count_nonzero(self.refcounts == 0))
+
+    def close(self, unlink=None):
+        """Cierra el bloque; quien lo creó además lo elimina.
+
+        Las vistas devueltas por view deben haberse descartado antes.
+        """
+        self.refcounts = None
+        try:
+            self.memory.close()
+        except BufferError:
+            # Queda alguna vista viva: el bloque se libera al terminar el proceso
+            pass
+        if self.owner if unlink is None else unlink:
+            self.memory.unlink()
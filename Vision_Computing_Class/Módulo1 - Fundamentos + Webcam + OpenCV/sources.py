@@ -0,0 +1,256 @@
+"""Fuentes de frames seleccionables por URI.
+
+Todas las fuentes imitan la interfaz de cv2.VideoCapture (isOpened, read y
+release), así que pueden usarse directamente con FrameGrabber. Además
+exponen width, height y fps.
+
+URIs soportadas:
+    0, 1, camera:0              cámara por índice
+    video.mp4, video:ruta       archivo de video
+    carpeta/, images:carpeta    secuencia de imágenes ordenadas por nombre
+    synthetic:1280x720@30       patrón sintético determinista (@0 = sin límite)
+    captura.vfs, frames:ruta    frames crudos grabados con framestore.py (sin decodificar)
+
+Opciones al final de la URI: ?loop=1, ?fps=25, ?frames=300, ?seed=7
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+class Pacer:
+    """Espacia las lecturas para simular una fuente en tiempo real"""
+    def __init__(self, fps, realtime=True):
+        self.period = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.next_time = None
+
+    def wait(self):
+        if self.period == 0.0:
+            return
+        now = time.monotonic()
+        if self.next_time is None or now - self.next_time > self.period:
+            # Primer frame o nos atrasamos demasiado: no intentar recuperar
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.period
+
+
+class CameraSource:
+    """Cámara local abierta por índice"""
+    def __init__(self, index=0):
+        self.cap = cv2.VideoCapture(index)
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        return self.cap.read(image)
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource:
+    """Archivo de video, opcionalmente en bucle y al ritmo de su FPS"""
+    def __init__(self, path, realtime=True, loop=False, fps=None):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.loop = loop
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = Pacer(self.fps, realtime)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        self.pacer.wait()
+        ret, frame = self.cap.read(image)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image)
+        if not ret:
+            # Fin del archivo
+            self.cap.release()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource:
+    """Carpeta de imágenes leídas en orden alfabético"""
+    def __init__(self, directory, realtime=True, loop=False, fps=30.0):
+        self.files = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self.loop = loop
+        self.fps = fps
+        self.pacer = Pacer(fps, realtime)
+        self.index = 0
+        self.opened = len(self.files) > 0
+        self.width = self.height = 0
+        if self.opened:
+            first = cv2.imread(self.files[0])
+            self.height, self.width = first.shape[:2]
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        if self.index >= len(self.files):
+            if not self.loop:
+                self.opened = False
+                return False, None
+            self.index = 0
+        self.pacer.wait()
+        frame = cv2.imread(self.files[self.index])
+        self.index += 1
+        if frame is None:
+            return False, None
+        if frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height))
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            frame = image
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+class SyntheticSource:
+    """Patrón sintético determinista: barras, degradados, figuras y ruido que se desplazan"""
+    def __init__(self, width=1280, height=720, fps=30.0, realtime=True, frames=0, seed=0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = frames  # 0 = infinito
+        self.pacer = Pacer(fps, realtime)
+        self.index = 0
+        self.opened = True
+        # Textura más ancha que el frame; cada frame es una ventana desplazada
+        self.step = max(1, width // 160)
+        self.texture = self._make_texture(width + 160 * self.step, height, seed)
+
+    @staticmethod
+    def _make_texture(width, height, seed):
+        rng = np.random.default_rng(seed)
+        texture = np.empty((height, width, 3), np.uint8)
+        # Degradado horizontal y vertical de fondo
+        xs = np.linspace(0, 255, width, dtype=np.float32)
+        ys = np.linspace(0, 255, height, dtype=np.float32)
+        texture[:, :, 0] = xs[np.newaxis, :].astype(np.uint8)
+        texture[:, :, 1] = ys[:, np.newaxis].astype(np.uint8)
+        texture[:, :, 2] = 128
+        # Barras de color en el tercio superior
+        bar_width = max(1, width // 16)
+        colors = rng.integers(0, 256, size=(width // bar_width + 1, 3), dtype=np.uint8)
+        bars = np.repeat(colors, bar_width, axis=0)[:width]
+        texture[:height // 3] = bars[np.newaxis, :, :]
+        # Tablero de ajedrez en el tercio inferior
+        cell = max(4, height // 24)
+        yy, xx = np.mgrid[height * 2 // 3:height, 0:width]
+        board = (((yy // cell) + (xx // cell)) % 2 * 255).astype(np.uint8)
+        texture[height * 2 // 3:] = board[:, :, np.newaxis]
+        # Círculos y rectángulos de tamaño y posición aleatorios (con semilla)
+        for _ in range(max(4, width // 80)):
+            center = (int(rng.integers(0, width)), int(rng.integers(height // 3, height)))
+            color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+            radius = int(rng.integers(height // 40 + 1, height // 8 + 2))
+            if rng.random() < 0.5:
+                cv2.circle(texture, center, radius, color, -1)
+            else:
+                cv2.rectangle(texture, (center[0] - radius, center[1] - radius),
+                              (center[0] + radius, center[1] + radius), color, -1)
+        # Ruido leve para que los filtros tengan trabajo realista
+        noise = rng.integers(-8, 9, size=texture.shape, dtype=np.int16)
+        return np.clip(texture.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        if self.frames and self.index >= self.frames:
+            self.opened = False
+            return False, None
+        self.pacer.wait()
+        offset = (self.index % 160) * self.step
+        window = self.texture[:, offset:offset + self.width]
+        if image is None or image.shape != window.shape:
+            image = np.empty(window.shape, np.uint8)
+        np.copyto(image, window)
+        self.index += 1
+        return True, image
+
+    def release(self):
+        self.opened = False
+
+
+def parse_options(query):
+    """Convierte 'loop=1&fps=25' en un diccionario"""
+    options = {}
+    for item in query.split("&"):
+        if item:
+            key, _, value = item.partition("=")
+            options[key] = value
+    return options
+
+
+def open_source(uri, realtime=True):
+    """Abre la fuente descrita por uri. realtime=False lee tan rápido como sea posible"""
+    uri = str(uri)
+    query = ""
+    if "?" in uri:
+        uri, query = uri.rsplit("?", 1)
+    options = parse_options(query)
+    loop = options.get("loop", "0") not in ("0", "false", "")
+    fps = float(options["fps"]) if "fps" in options else None
+
+    scheme, sep, rest = uri.partition(":")
+    if not sep or scheme not in ("camera", "video", "images", "synthetic", "frames"):
+        # Sin esquema: adivinar a partir del valor
+        if uri.isdigit():
+            scheme, rest = "camera", uri
+        elif os.path.isdir(uri):
+            scheme, rest = "images", uri
+        elif uri.lower().endswith(".vfs"):
+            scheme, rest = "frames", uri
+        else:
+            scheme, rest = "video", uri
+
+    if scheme == "camera":
+        return CameraSource(int(rest or 0))
+    if scheme == "video":
+        return VideoFileSource(rest, realtime=realtime, loop=loop, fps=fps)
+    if scheme == "images":
+        return ImageSequenceSource(rest, realtime=realtime, loop=loop, fps=fps or 30.0)
+    if scheme == "frames":
+        # framestore importa Pacer de este módulo
+        from framestore import FrameStoreSource
+        return FrameStoreSource(rest, realtime=realtime, loop=loop, fps=fps)
+
+    # synthetic:WxH@fps
+    size, _, rate = rest.partition("@")
+    width, height = 1280, 720
+    if size:
+        try:
+            width, height = (int(v) for v in size.lower().split("x"))
+        except ValueError:
+            raise ValueError(f"Resolución inválida en la URI sintética: {size!r}")
+    rate = float(rate) if rate else (fps or 30.0)
+    return SyntheticSource(width, height, fps=rate, realtime=realtime and rate > 0,
+                           frames=int(options.get("frames", 0)),
+                           seed=int(options.get("seed", 0)))
@@ -0,0 +1,10 @@
+"""Configuración común de las pruebas.
+
+Los módulos del curso se importan por nombre (from tiling import ...), así
+que la carpeta del módulo se agrega al path. Se ejecutan con:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
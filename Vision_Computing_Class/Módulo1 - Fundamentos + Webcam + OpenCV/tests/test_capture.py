@@ -0,0 +1,122 @@
+"""Buffer circular de FrameGrabber: último frame, descartes y reintentos"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import capture
+from capture import FrameGrabber
+
+
+class CountingSource:
+    """Fuente falsa: el frame n vale n % 256; falla las lecturas de fail_after en adelante"""
+    def __init__(self, shape=(4, 6, 3), fail_after=None, delay=0.001):
+        self.shape = shape
+        self.fail_after = fail_after
+        self.delay = delay
+        self.reads = 0
+        self.opened = True
+        self.released = threading.Event()
+
+    def read(self, image=None):
+        time.sleep(self.delay)
+        if self.fail_after is not None and self.reads >= self.fail_after:
+            return False, None
+        self.reads += 1
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, np.uint8)
+        image[...] = self.reads % 256
+        return True, image
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+        self.released.set()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_buffer_needs_three_slots():
+    with pytest.raises(ValueError):
+        FrameGrabber(CountingSource(), buffer_size=2)
+
+
+def test_start_fails_without_first_frame():
+    grabber = FrameGrabber(CountingSource(fail_after=0))
+    assert not grabber.start()
+
+
+def test_read_latest_returns_newest_frame():
+    source = CountingSource()
+    grabber = FrameGrabber(source)
+    assert grabber.start()
+    try:
+        frame, sequence, _ = grabber.wait_latest(10, timeout=2.0)
+        assert sequence > 10
+        # Cada lectura publica un frame: el contenido corresponde a la secuencia
+        assert frame[0, 0, 0] == sequence % 256
+        assert np.all(frame == frame[0, 0, 0])
+    finally:
+        grabber.stop()
+    assert source.released.is_set()
+
+
+def test_frames_not_read_are_counted_as_dropped():
+    grabber = FrameGrabber(CountingSource())
+    assert grabber.start()
+    try:
+        assert wait_until(lambda: grabber.sequence >= 20)
+    finally:
+        grabber.stop()
+    # Nadie leyó: todos menos el último se descartaron
+    assert grabber.dropped_frames == grabber.sequence - 1
+
+
+def test_frame_held_by_reader_is_not_overwritten():
+    grabber = FrameGrabber(CountingSource())
+    assert grabber.start()
+    try:
+        frame, sequence, _ = grabber.wait_latest(0, timeout=2.0)
+        held = frame.copy()
+        assert wait_until(lambda: grabber.sequence >= sequence + 20)
+        assert np.array_equal(frame, held)
+    finally:
+        grabber.stop()
+
+
+def test_pause_stops_reading():
+    source = CountingSource()
+    grabber = FrameGrabber(source)
+    assert grabber.start()
+    try:
+        grabber.pause()
+        time.sleep(0.02)  # Termina la lectura en curso
+        reads = source.reads
+        time.sleep(0.05)
+        assert source.reads == reads
+        grabber.resume()
+        assert wait_until(lambda: source.reads > reads)
+    finally:
+        grabber.stop()
+
+
+def test_gives_up_after_consecutive_failures(monkeypatch):
+    monkeypatch.setattr(capture, "MAX_FAILED_READS", 3)
+    source = CountingSource(fail_after=1)
+    grabber = FrameGrabber(source)
+    assert grabber.start()
+    assert wait_until(lambda: grabber.finished)
+    assert grabber.gave_up
+    assert grabber.failed_reads == 3
+    assert source.released.is_set()
+    grabber.stop()
@@ -0,0 +1,126 @@
+"""Contadores de referencias de SharedFrameRing y lectura de la fuente en el proceso de captura"""
+import multiprocessing
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+import process_pipeline
+from shared_frames import SharedFrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(3, (4, 5, 3), multiprocessing.Lock())
+    yield ring
+    ring.close()
+
+
+def test_acquire_until_full(ring):
+    indices = [ring.acquire() for _ in range(3)]
+    assert sorted(indices) == [0, 1, 2]
+    assert ring.acquire() is None
+    assert ring.free_slots == 0
+
+
+def test_slot_is_free_only_after_last_release(ring):
+    index = ring.acquire()
+    ring.retain(index, 2)
+    for _ in range(2):
+        ring.release(index)
+        assert ring.free_slots == 2
+    ring.release(index)
+    assert ring.free_slots == 3
+
+
+def test_released_slot_is_reused(ring):
+    first = [ring.acquire() for _ in range(3)]
+    ring.release(first[1])
+    assert ring.acquire() == first[1]
+
+
+def test_release_and_retain_of_free_slot_fail(ring):
+    with pytest.raises(ValueError):
+        ring.release(0)
+    with pytest.raises(ValueError):
+        ring.retain(0)
+
+
+def test_view_rejects_shapes_larger_than_a_slot(ring):
+    assert ring.view(0, (2, 5, 3)).shape == (2, 5, 3)
+    with pytest.raises(ValueError):
+        ring.view(0, (5, 5, 3))
+
+
+def test_attached_ring_shares_frames_and_counters(ring):
+    other = SharedFrameRing.attach(ring.spec(), ring.lock)
+    try:
+        index = ring.acquire()
+        ring.view(index)[...] = 7
+        assert np.all(other.view(index) == 7)
+        other.release(index)
+        assert ring.free_slots == 3
+    finally:
+        other.close()
+
+
+class ScriptedSource:
+    """Fuente que nunca escribe en image: devuelve siempre su propio arreglo"""
+    fps = 30.0
+
+    def __init__(self, shapes):
+        self.shapes = shapes
+        self.reads = 0
+
+    def isOpened(self):
+        return self.reads < len(self.shapes)
+
+    def read(self, image=None):
+        self.reads += 1
+        return True, np.full(self.shapes[self.reads - 1], self.reads, np.uint8)
+
+    def release(self):
+        pass
+
+
+def run_capture(monkeypatch, shapes):
+    """Ejecuta _capture_main en un hilo y devuelve (valores publicados, descartados, slots libres)"""
+    monkeypatch.setattr(process_pipeline, "open_source", lambda uri: ScriptedSource(shapes))
+    lock = multiprocessing.Lock()
+    # Un slot por frame: el anillo nunca se llena y no hay descartes por falta de slots
+    ring = SharedFrameRing(len(shapes), shapes[0], lock)
+    info, setup, frames = queue.Queue(), queue.Queue(), queue.Queue()
+    frames.cancel_join_thread = lambda: None
+    stop, dropped = threading.Event(), multiprocessing.Value("i", 0)
+    setup.put(ring.spec())
+    thread = threading.Thread(target=process_pipeline._capture_main,
+                              args=("falsa", lock, info, setup, frames, stop, dropped))
+    thread.start()
+    values = []
+    while thread.is_alive() or not frames.empty():
+        try:
+            index, _, _ = frames.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        values.append(int(ring.view(index)[0, 0, 0]))
+        ring.release(index)
+    thread.join()
+    free = ring.free_slots
+    ring.close()
+    return values, dropped.value, free
+
+
+def test_capture_copies_frames_returned_by_the_source(monkeypatch):
+    values, dropped, free = run_capture(monkeypatch, [(4, 5, 3)] * 6)
+    assert values == [1, 2, 3, 4, 5, 6]
+    assert dropped == 0
+    assert free == 6
+
+
+def test_capture_drops_frames_that_do_not_fit(monkeypatch):
+    shapes = [(4, 5, 3)] * 3 + [(8, 9, 3)] * 3
+    values, dropped, free = run_capture(monkeypatch, shapes)
+    assert values == [1, 2, 3]
+    assert dropped == 3
+    assert free == 6
@@ -0,0 +1,115 @@
+"""Equivalencia bit a bit entre TiledExecutor y el grafo sobre el frame completo"""
+import numpy as np
+import pytest
+
+from graph import EDGE_GRAPH, FILTER_GRAPH, default_params
+from processing import BLUR_ENGINES, SOBEL_ENGINES, THRESHOLD_TYPES
+from sources import SyntheticSource
+from tiling import TiledExecutor
+
+# Tamaños impares y franjas que no dividen exacto para cubrir los bordes
+SIZES = [(320, 240), (333, 217), (64, 37)]
+BAND_COUNTS = (2, 3, 5, 8)
+
+
+def verification_cases():
+    """(grafo, modo, parámetros) cubriendo los rangos de todos los controles"""
+    for mode in EDGE_GRAPH.modes:
+        if mode == "sobel":
+            for engine in SOBEL_ENGINES:
+                for kernel in (1, 3, 5, 7):
+                    for scale, delta in ((1.0, 0), (3.5, 40)):
+                        yield EDGE_GRAPH, mode, {"sobel_engine": engine, "sobel_kernel": kernel,
+                                                 "sobel_scale": scale, "sobel_delta": delta}
+        elif mode == "canny":
+            for t1, t2 in ((0, 50), (50, 150), (200, 255)):
+                yield EDGE_GRAPH, mode, {"canny_threshold1": t1, "canny_threshold2": t2}
+        else:
+            yield EDGE_GRAPH, mode, {}
+    for mode in FILTER_GRAPH.modes:
+        kernels = (1, 3, 5, 9, 15, 21, 31) if mode in ("blur", "binary_blur") else (5,)
+        engines = BLUR_ENGINES if mode in ("blur", "binary_blur") else ("auto",)
+        types = THRESHOLD_TYPES if mode in ("binary", "binary_blur") else ("BINARY",)
+        for kernel in kernels:
+            for sigma in ((0.0, 2.5, 10.0) if kernel > 1 else (0.0,)):
+                for engine in engines:
+                    for threshold_type in types:
+                        yield FILTER_GRAPH, mode, {"blur_kernel_size": kernel, "blur_sigma_x": sigma,
+                                                   "blur_engine": engine, "threshold_type": threshold_type,
+                                                   "threshold_value": 100}
+
+
+def case_id(case):
+    graph, mode, overrides = case
+    return "-".join([graph.name, mode] + [str(value) for value in overrides.values()])
+
+
+@pytest.fixture(scope="module")
+def frames():
+    """Frame sintético por tamaño, creado una sola vez"""
+    cache = {}
+
+    def frame(size):
+        if size not in cache:
+            width, height = size
+            cache[size] = SyntheticSource(width, height, realtime=False, seed=width * height).read()[1]
+        return cache[size]
+    return frame
+
+
+@pytest.fixture(scope="module")
+def executors():
+    """Un TiledExecutor por (grafo, franjas), compartido por todos los casos"""
+    cache = {}
+
+    def executor(graph, bands):
+        key = (graph.name, bands)
+        if key not in cache:
+            cache[key] = TiledExecutor(graph, bands)
+        return cache[key]
+    yield executor
+    for executor in cache.values():
+        executor.close()
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: "{}x{}".format(*size))
+@pytest.mark.parametrize("bands", BAND_COUNTS, ids=lambda bands: f"franjas{bands}")
+@pytest.mark.parametrize("case", list(verification_cases()), ids=case_id)
+def test_tiled_matches_whole_frame(case, bands, size, frames, executors):
+    graph, mode, overrides = case
+    params = default_params()
+    params.update(overrides)
+    params["mode"] = mode
+    frame = frames(size)
+    expected = graph.process(frame, params)
+    tiled = executors(graph, bands).process(frame, params)
+    assert tiled.shape == expected.shape
+    assert np.array_equal(tiled, expected)
+
+
+@pytest.mark.parametrize("height", (37, 217, 240))
+@pytest.mark.parametrize("halo", (0, 1, 14, 21))
+def test_split_covers_every_row_once(height, halo):
+    executor = TiledExecutor(FILTER_GRAPH, bands=5)
+    try:
+        bands = executor.split(height, halo)
+    finally:
+        executor.close()
+    rows = [row for _, top, bottom, _ in bands for row in range(top, bottom)]
+    assert rows == list(range(height))
+    for start, top, bottom, end in bands:
+        # Inicio par para el motor pyramid y halo completo salvo en los bordes del frame
+        assert start % 2 == 0
+        assert start == 0 or top - start >= halo
+        assert end == height or end - bottom >= halo
+
+
+def test_canny_runs_on_whole_frame(frames):
+    executor = TiledExecutor(EDGE_GRAPH, bands=4)
+    try:
+        params = default_params()
+        params["mode"] = "canny"
+        executor.process(frames(SIZES[0]), params)
+    finally:
+        executor.close()
+    assert (executor.whole_frames, executor.tiled_frames) == (1, 0)
@@ -0,0 +1,92 @@
+"""Entrega en orden y descartes de ProcessingPool"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from graph import FILTER_GRAPH, default_params
+from sources import SyntheticSource
+from workers import ProcessingPool
+
+
+class SleepyGraph:
+    """Grafo falso: tarda frame[0] milisegundos y devuelve frame + 1"""
+    def process(self, frame, params, pool=None):
+        time.sleep(int(frame[0]) / 1000)
+        return frame + 1
+
+
+class GatedGraph:
+    """Grafo falso: los frames con frame[0] == 1 no terminan hasta que se abre la compuerta"""
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def process(self, frame, params, pool=None):
+        if frame[0] == 1:
+            self.gate.wait(timeout=5.0)
+        return frame
+
+
+def test_results_are_delivered_in_submission_order():
+    pool = ProcessingPool(SleepyGraph(), workers=4, depth=8)
+    try:
+        # Los primeros frames tardan más: terminan después que los siguientes
+        for sequence, delay in enumerate((40, 30, 20, 10, 0, 0)):
+            assert pool.submit(np.array([delay], np.uint8), sequence, {})
+        results = pool.drain()
+    finally:
+        pool.close()
+    assert [sequence for sequence, _, _, _ in results] == [0, 1, 2, 3, 4, 5]
+    assert [int(result[0]) for _, result, _, _ in results] == [41, 31, 21, 11, 1, 1]
+
+
+def test_collect_waits_for_earlier_frames():
+    graph = GatedGraph()
+    pool = ProcessingPool(graph, workers=2, depth=4)
+    try:
+        pool.submit(np.ones(1, np.uint8), 0, {})
+        pool.submit(np.zeros(1, np.uint8), 1, {})  # Termina enseguida, pero es el segundo
+        time.sleep(0.05)
+        assert pool.pending[1][1].done()
+        assert pool.collect() == []
+        graph.gate.set()
+        assert [sequence for sequence, _, _, _ in pool.drain()] == [0, 1]
+    finally:
+        graph.gate.set()
+        pool.close()
+
+
+def test_full_queue_drops_or_blocks():
+    graph = GatedGraph()
+    pool = ProcessingPool(graph, workers=1, depth=2)
+    try:
+        frame = np.ones(1, np.uint8)
+        assert pool.submit(frame, 0, {})
+        assert pool.submit(frame, 1, {})
+        assert not pool.submit(frame, 2, {})
+        assert pool.stats()["dropped"] == 1
+        graph.gate.set()
+        assert pool.submit(frame, 3, {}, block=True)
+        assert [sequence for sequence, _, _, _ in pool.drain()] == [0, 1, 3]
+    finally:
+        graph.gate.set()
+        pool.close()
+
+
+@pytest.mark.parametrize("backend", ("thread", "process"))
+def test_backends_match_the_graph(backend):
+    params = default_params()
+    params["mode"] = "binary_blur"
+    source = SyntheticSource(160, 120, realtime=False)
+    frames = [source.read()[1].copy() for _ in range(5)]
+    pool = ProcessingPool(FILTER_GRAPH, workers=2, backend=backend)
+    try:
+        for sequence, frame in enumerate(frames):
+            pool.submit(frame, sequence, params, block=True)
+        results = pool.drain()
+    finally:
+        pool.close()
+    assert [sequence for sequence, _, _, _ in results] == list(range(5))
+    for frame, (_, result, _, _) in zip(frames, results):
+        assert np.array_equal(result, FILTER_GRAPH.process(frame, params))
@@ -0,0 +1,135 @@
+"""Ejecución por franjas de un solo frame en varios hilos.
+
+TiledExecutor divide el frame en franjas horizontales, ejecuta el grafo
+de filtros sobre cada una en paralelo y las une. Para que el resultado sea
+idéntico bit a bit al del frame completo, cada franja se amplía con un
+margen (halo) de filas vecinas igual a la suma de los radios de los
+kernels de la cadena (blur: blur_radius de blur.py, Sobel: ksize // 2,
+mínimo 1); las filas del margen se calculan con el borde de la franja y se
+descartan. Las franjas y el halo tienen una cantidad par de filas, porque
+el motor pyramid del blur reduce la imagen tomando pares de filas.
+
+Canny no se divide: la histéresis sigue bordes por toda la imagen, así que
+un grafo que lo usa (o que redimensiona) se ejecuta sobre el frame completo.
+
+La equivalencia con el frame completo en todos los modos se comprueba en
+tests/test_tiling.py (python -m pytest tests). Latencia con y sin franjas:
+    python tiling.py --resolution 3840x2160 --bands 4
+"""
+import argparse
+import concurrent.futures
+import os
+import time
+
+import numpy as np
+
+from blur import blur_radius
+from buffers import BufferPool, pool_buffer
+from graph import EDGE_GRAPH, FILTER_GRAPH, default_params
+from sources import SyntheticSource
+
+# Filas de vecindad que necesita cada operación; las que no están no se pueden dividir
+OP_RADIUS = {
+    "gray": lambda args: 0,
+    "threshold": lambda args: 0,
+    "gamma": lambda args: 0,
+    "invert": lambda args: 0,
+    "blur": lambda args: blur_radius(args["ksize"], args["sigma"], args["engine"]),
+    "sobel": lambda args: max(1, args["ksize"] // 2),  # ksize=1 usa un kernel de 3x1
+}
+
+
+class TiledExecutor:
+    """Ejecuta graph.run por franjas horizontales con halo"""
+    def __init__(self, graph, bands=None, workers=None):
+        self.graph = graph
+        self.bands = bands or os.cpu_count() or 1
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers or self.bands,
+                                                              thread_name_prefix="franja")
+        self.pools = [BufferPool() for _ in range(self.bands)]  # Uno por franja
+        self.tiled_frames = 0
+        self.whole_frames = 0
+
+    def halo(self, outputs, params):
+        """Filas de margen necesarias para outputs, o None si la cadena no se puede dividir"""
+        reach = {self.graph.input_name: 0}
+        for node in self.graph.plan(outputs):
+            radius = OP_RADIUS.get(node.op.name)
+            if radius is None:
+                return None
+            reach[node.name] = radius(node.resolve(params)) + max(reach[name] for name in node.inputs)
+        return max(reach[name] for name in outputs)
+
+    def split(self, height, halo):
+        """Franjas como (inicio con halo, inicio, fin, fin con halo)"""
+        halo += halo % 2  # Inicios de franja en filas pares (ver docstring)
+        bands = max(1, min(self.bands, height // max(1, 2 * halo + 1)))
+        rows = -(-height // bands)
+        rows += rows % 2
+        return [(max(0, top - halo), top, min(height, top + rows), min(height, top + rows + halo))
+                for top in range(0, height, rows)]
+
+    def run(self, frame, params, outputs, pool=None):
+        """Como graph.run, pero por franjas cuando se puede. Devuelve {nombre: imagen}"""
+        outputs = tuple(outputs)
+        halo = self.halo(outputs, params)
+        if self.bands <= 1 or halo is None or all(name == self.graph.input_name for name in outputs):
+            self.whole_frames += 1
+            return self.graph.run(frame, params, outputs, pool)
+
+        bands = self.split(frame.shape[0], halo)
+        futures = [self.executor.submit(self.graph.run, frame[start:end], params, outputs, self.pools[i])
+                   for i, (start, _, _, end) in enumerate(bands)]
+        results = {}
+        for (start, top, bottom, _), future in zip(bands, futures):
+            for name, band in future.result().items():
+                if name not in results:
+                    shape = (frame.shape[0],) + band.shape[1:]
+                    results[name] = pool_buffer(pool, "tiled_" + name, shape, band.dtype)
+                    if results[name] is None:
+                        results[name] = np.empty(shape, band.dtype)
+                # Descartar el halo: solo se copian las filas propias de la franja
+                results[name][top:bottom] = band[top - start:bottom - start]
+        self.tiled_frames += 1
+        return results
+
+    def process(self, frame, params, pool=None):
+        """Resultado del modo params["mode"], por franjas"""
+        output = self.graph.output_for(params["mode"])
+        return self.run(frame, params, (output,), pool)[output]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecución por franjas con halo")
+    parser.add_argument("--resolution", default="3840x2160", help="Resolución para medir latencia (WxH)")
+    parser.add_argument("--bands", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--frames", type=int, default=10)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+    frame = SyntheticSource(width, height, realtime=False).read()[1]
+    pool = BufferPool()
+    for graph in (EDGE_GRAPH, FILTER_GRAPH):
+        executor = TiledExecutor(graph, args.bands)
+        for mode in graph.modes:
+            params = default_params()
+            params.update({"mode": mode, "blur_kernel_size": 31, "sobel_kernel": 7})
+            timings = {}
+            for name, run in (("completo", lambda: graph.process(frame, params, pool)),
+                              ("franjas", lambda: executor.process(frame, params, pool))):
+                run()
+                start = time.perf_counter()
+                for _ in range(args.frames):
+                    run()
+                timings[name] = (time.perf_counter() - start) / args.frames * 1000
+            print(f"{mode:12s} completo: {timings['completo']:7.1f} ms | "
+                  f"{args.bands} franjas: {timings['franjas']:7.1f} ms")
+        executor.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
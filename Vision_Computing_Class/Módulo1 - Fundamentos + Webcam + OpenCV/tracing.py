@@ -0,0 +1,186 @@
+"""Trazas por frame en formato Chrome / Perfetto.
+
+TraceRecorder guarda en un anillo de tamaño fijo (los eventos más viejos
+se descartan) un evento por cada etapa medida: inicio, duración e hilo.
+Con el trazado activo las aplicaciones registran:
+
+    update_frame    cada vuelta del ciclo de la interfaz
+    tk_idle         el tiempo entre vueltas, en que Tk atiende eventos y dibuja
+    capture, process, resize, color, photo, paint
+                    las etapas de Instrumentation (ver instrumentation.py)
+    nodos del grafo cada etapa de process_frame (gray, canny, blurred...)
+
+dump escribe el anillo como JSON de Chrome trace, que se abre sin conexión
+en chrome://tracing o en ui.perfetto.dev. FpsDropTrigger decide cuándo
+guardar una traza automáticamente al caer los FPS, y SamplingProfiler
+agrega muestras periódicas de la pila del hilo de la interfaz para ver qué
+función se estaba ejecutando entre etapas.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+SAMPLER_TID = 1  # Identificador de la pista de las muestras del profiler
+
+
+class _Span:
+    """Context manager que registra un evento completo al salir del bloque"""
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class _NoSpan:
+    """Span vacío para cuando el trazado está desactivado"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class TraceRecorder:
+    """Anillo de eventos (nombre, inicio, duración, hilo) con exportación a Chrome trace"""
+    def __init__(self, capacity=50000):
+        self.events = deque(maxlen=capacity)
+        self.enabled = False
+        self.thread_names = {}
+        self.pid = os.getpid()
+
+    def span(self, name, **args):
+        """Mide un bloque: with tracer.span("canny"): ..."""
+        return _Span(self, name, args or None) if self.enabled else _NO_SPAN
+
+    def complete(self, name, start_ns, duration_ns, args=None, tid=None):
+        """Registra un evento ya medido (perf_counter_ns). duration_ns None es un evento instantáneo"""
+        if not self.enabled:
+            return
+        if tid is None:
+            tid = threading.get_ident()
+            if tid not in self.thread_names:
+                self.thread_names[tid] = threading.current_thread().name
+        self.events.append((name, start_ns, duration_ns, tid, args))
+
+    def instant(self, name, args=None, tid=None):
+        self.complete(name, time.perf_counter_ns(), None, args, tid)
+
+    def clear(self):
+        self.events.clear()
+
+    def chrome_events(self):
+        """Eventos en el formato de Chrome trace (tiempos en microsegundos)"""
+        events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in list(self.thread_names.items())]
+        for name, start, duration, tid, args in list(self.events):
+            event = {"name": name, "pid": self.pid, "tid": tid, "ts": start / 1000}
+            if duration is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=duration / 1000)
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def dump(self, path, metadata=None):
+        """Escribe la traza en path (JSON de Chrome trace). Devuelve la cantidad de eventos"""
+        events = self.chrome_events()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata or {}}, f)
+        return len(events)
+
+    def dump_async(self, path, metadata=None):
+        """Como dump, pero escribe el archivo en otro hilo (la copia del anillo se hace ahora)"""
+        events = self.chrome_events()
+
+        def write():
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata or {}}, f)
+
+        threading.Thread(target=write, name="traza", daemon=True).start()
+        return len(events)
+
+
+class FpsDropTrigger:
+    """Indica cuándo guardar una traza porque los FPS recientes cayeron bajo un umbral"""
+    def __init__(self, stats, min_fps, frames=30, cooldown=30.0):
+        self.stats = stats
+        self.min_fps = min_fps
+        self.frames = frames  # Frames sobre los que se calcula el FPS reciente
+        self.cooldown = cooldown  # Segundos mínimos entre dos disparos
+        self.last_fired = None
+        self.fired = 0
+
+    def check(self):
+        """True si hay que guardar una traza ahora"""
+        now = time.monotonic()
+        if self.last_fired is not None and now - self.last_fired < self.cooldown:
+            return False
+        fps = self.stats.fps(self.frames)
+        if fps == 0.0 or fps >= self.min_fps:
+            return False
+        self.last_fired = now
+        self.fired += 1
+        return True
+
+
+class SamplingProfiler:
+    """Muestrea la pila de un hilo cada interval segundos y la agrega a la traza"""
+    def __init__(self, tracer, thread_id, interval=0.005, depth=8):
+        self.tracer = tracer
+        self.thread_id = thread_id
+        self.interval = interval
+        self.depth = depth
+        self.counts = Counter()  # Función en ejecución -> cantidad de muestras
+        self.stop_event = threading.Event()
+        self.thread = None
+        tracer.thread_names[SAMPLER_TID] = "muestras"
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            del frame
+            if not stack:
+                continue
+            top = stack[0].split(" (")[0]
+            self.counts[top] += 1
+            self.tracer.instant(top, {"stack": " < ".join(stack)}, tid=SAMPLER_TID)
+
+    def top(self, count=10):
+        """Funciones con más muestras: [(función, muestras)]"""
+        return self.counts.most_common(count)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
@@ -0,0 +1,126 @@
+"""Widgets de Tk compartidos por las aplicaciones.
+
+Los botones de modo y los controles de parámetros se generan a partir del
+grafo de filtros (graph.py): agregar un parámetro o un modo al JSON del
+grafo basta para que aparezca en la interfaz.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class ToolTip:
+    """Clase para crear tooltips que aparecen al hacer hover"""
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        self.tipwindow = None
+        self.id = None
+        self.x = self.y = 0
+        self.widget.bind('<Enter>', self.enter)
+        self.widget.bind('<Leave>', self.leave)
+        self.widget.bind('<ButtonPress>', self.leave)
+
+    def enter(self, event=None):
+        self.schedule()
+
+    def leave(self, event=None):
+        self.unschedule()
+        self.hidetip()
+
+    def schedule(self):
+        self.unschedule()
+        self.id = self.widget.after(500, self.showtip)
+
+    def unschedule(self):
+        id = self.id
+        self.id = None
+        if id:
+            self.widget.after_cancel(id)
+
+    def showtip(self):
+        x, y, cx, cy = self.widget.bbox("insert") if hasattr(self.widget, 'bbox') else (0, 0, 0, 0)
+        x += self.widget.winfo_rootx() + 25
+        y += self.widget.winfo_rooty() + 20
+        self.tipwindow = tw = tk.Toplevel(self.widget)
+        tw.wm_overrideredirect(True)
+        tw.wm_geometry("+%d+%d" % (x, y))
+        label = tk.Label(tw, text=self.text, justify=tk.LEFT,
+                        background="#ffffe0", relief=tk.SOLID, borderwidth=1,
+                        font=("tahoma", "8", "normal"), wraplength=250)
+        label.pack(ipadx=1)
+
+    def hidetip(self):
+        tw = self.tipwindow
+        self.tipwindow = None
+        if tw:
+            tw.destroy()
+
+
+def info_icon(parent, text):
+    """Ícono ℹ con tooltip"""
+    info_label = ttk.Label(parent, text="ℹ", width=2, cursor="hand2")
+    ToolTip(info_label, text)
+    return info_label
+
+
+def build_mode_buttons(parent, graph, on_select):
+    """Un botón con su ícono de información por cada modo del grafo"""
+    for name, mode in graph.modes.items():
+        frame = ttk.Frame(parent)
+        frame.pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame, text=mode.get("label", name),
+                   command=lambda name=name: on_select(name)).pack(side=tk.LEFT)
+        info_icon(frame, mode.get("tooltip", "")).pack(side=tk.LEFT, padx=2)
+
+
+def create_param_vars(graph):
+    """Variables de Tk con el valor por defecto de cada parámetro del grafo"""
+    variables = {}
+    for param in graph.params:
+        if param.type == "float":
+            variables[param.name] = tk.DoubleVar(value=param.default)
+        elif param.type == "choice":
+            variables[param.name] = tk.StringVar(value=param.default)
+        else:
+            variables[param.name] = tk.IntVar(value=param.default)
+    return variables
+
+
+def build_param_frames(parent, graph, variables, on_change):
+    """Crea un LabelFrame por grupo de parámetros. Devuelve {grupo: frame}
+
+    on_change(nombre, valor) se llama cuando el usuario mueve un control.
+    """
+    frames = {}
+    for group, params in graph.param_groups().items():
+        frame = ttk.LabelFrame(parent, padding="5")
+        for row, param in enumerate(params):
+            variable = variables[param.name]
+            ttk.Label(frame, text=param.label).grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+            info_icon(frame, param.tooltip).grid(row=row, column=1, padx=2, pady=2, sticky=tk.W)
+
+            if param.type == "choice":
+                combo = ttk.Combobox(frame, textvariable=variable, values=list(param.options),
+                                     state="readonly", width=15)
+                combo.grid(row=row, column=2, padx=5, pady=2, sticky=tk.W)
+                combo.bind("<<ComboboxSelected>>",
+                           lambda e, name=param.name, variable=variable: on_change(name, variable.get()))
+                continue
+
+            ttk.Scale(frame, from_=param.minimum, to=param.maximum, variable=variable,
+                      orient=tk.HORIZONTAL, length=200,
+                      command=lambda value, name=param.name: on_change(name, value)).grid(
+                row=row, column=2, padx=5, pady=2)
+            if param.format is None:
+                ttk.Label(frame, textvariable=variable).grid(row=row, column=3, padx=5, pady=2)
+            else:
+                # Valor con formato fijo (por ejemplo, un decimal para sigma)
+                value_label = ttk.Label(frame, text="")
+                value_label.grid(row=row, column=3, padx=5, pady=2)
+
+                def update_label(*args, label=value_label, param=param, variable=variable):
+                    label.config(text=param.display(variable.get()))
+                variable.trace_add("write", update_label)
+                update_label()
+        frames[group] = frame
+    return frames
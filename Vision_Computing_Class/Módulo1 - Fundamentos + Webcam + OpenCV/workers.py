@@ -0,0 +1,144 @@
+"""Procesamiento de frames en varios núcleos.
+
+ProcessingPool reparte los frames entre hilos o procesos que ejecutan el
+grafo de filtros y los entrega en el mismo orden en que se enviaron.
+
+    thread   hilos del mismo proceso; OpenCV libera el GIL en cv2.Canny,
+             cv2.GaussianBlur, etc., así que escalan con los núcleos
+    process  procesos separados; no dependen del GIL pero el frame y el
+             resultado se copian (pickle) entre procesos
+
+Como mucho hay depth frames en vuelo. Si la cola está llena, submit
+descarta el frame (modo en tiempo real) o espera al más antiguo (block=True,
+procesamiento por lotes).
+"""
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import time
+
+from buffers import BufferPool
+from graph import FilterGraph
+
+BACKENDS = ("thread", "process")
+
+# Estado de cada proceso trabajador (backend process)
+_process_graph = None
+_process_pool = None
+
+
+def _init_process_worker(spec):
+    global _process_graph, _process_pool
+    _process_graph = FilterGraph(spec)
+    _process_pool = BufferPool()
+
+
+def _process_in_worker(frame, params):
+    start = time.perf_counter()
+    # El resultado se serializa al devolverlo, así que puede quedar en el pool
+    result = _process_graph.process(frame, params, _process_pool)
+    return result, os.getpid(), time.perf_counter() - start
+
+
+class ProcessingPool:
+    """Ejecuta graph.process en workers y devuelve los resultados en orden"""
+    def __init__(self, graph, workers=2, backend="thread", depth=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend}")
+        self.graph = graph
+        self.workers = workers
+        self.backend = backend
+        self.depth = depth or 2 * workers
+        if backend == "thread":
+            self.executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="proceso")
+            self.local = threading.local()  # Un BufferPool por hilo
+        else:
+            # spawn funciona igual en Windows y Linux y no hereda el hilo de captura
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker, initargs=(graph.spec,))
+        self.pending = collections.deque()  # (sequence, future, params) en orden de envío
+
+        # Estadísticas
+        self.started = time.perf_counter()
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.depth_total = 0  # Suma de la profundidad de cola observada en cada submit
+        self.busy = {}  # Segundos de trabajo por worker
+
+    def _process_in_thread(self, frame, params):
+        start = time.perf_counter()
+        pool = getattr(self.local, "pool", None)
+        if pool is None:
+            pool = self.local.pool = BufferPool()
+        result = self.graph.process(frame, params, pool)
+        if result is not frame:
+            # El buffer del pool se reutiliza en el próximo frame de este hilo
+            result = result.copy()
+        return result, threading.current_thread().name, time.perf_counter() - start
+
+    @property
+    def in_flight(self):
+        return len(self.pending)
+
+    def submit(self, frame, sequence, params, block=False):
+        """Envía un frame propio (no se copia). Devuelve False si se descartó"""
+        self.depth_total += len(self.pending)
+        if len(self.pending) >= self.depth:
+            if not block:
+                self.dropped += 1
+                return False
+            concurrent.futures.wait([self.pending[0][1]])
+        if self.backend == "thread":
+            future = self.executor.submit(self._process_in_thread, frame, params)
+        else:
+            # Los snapshots de parámetros se envían como dict
+            future = self.executor.submit(_process_in_worker, frame, dict(params.items()))
+        self.pending.append((sequence, future, params))
+        self.submitted += 1
+        return True
+
+    def collect(self, wait=False):
+        """Resultados listos, en orden: [(sequence, procesado, params, segundos)]
+
+        Un frame terminado no se entrega hasta que terminen los anteriores.
+        Con wait=True espera al menos el primero pendiente.
+        """
+        if wait and self.pending:
+            concurrent.futures.wait([self.pending[0][1]])
+        ready = []
+        while self.pending and self.pending[0][1].done():
+            sequence, future, params = self.pending.popleft()
+            result, worker, seconds = future.result()
+            self.busy[worker] = self.busy.get(worker, 0.0) + seconds
+            self.completed += 1
+            ready.append((sequence, result, params, seconds))
+        return ready
+
+    def drain(self):
+        """Espera y devuelve todos los resultados pendientes"""
+        ready = []
+        while self.pending:
+            ready.extend(self.collect(wait=True))
+        return ready
+
+    def stats(self):
+        """Profundidad de cola, descartes y uso de cada worker (0-1)"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "depth": self.depth,
+            "in_flight": len(self.pending),
+            "average_queue_depth": self.depth_total / max(self.submitted + self.dropped, 1),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "utilization": {worker: busy / elapsed for worker, busy in sorted(self.busy.items())},
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)